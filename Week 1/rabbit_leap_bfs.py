@@ -1,52 +1,26 @@
-from collections import deque
-
-def possible_moves(state):
-    state = list(state)
-    moves = []
-    n = len(state)
-
-    for i in range(n):
-        if state[i] == 'E':  # move east (right)
-            # move one step
-            if i + 1 < n and state[i + 1] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i + 1] = new_state[i + 1], new_state[i]
-                moves.append(''.join(new_state))
-            # jump over one rabbit
-            if i + 2 < n and state[i + 1] in ['W'] and state[i + 2] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i + 2] = new_state[i + 2], new_state[i]
-                moves.append(''.join(new_state))
-
-        elif state[i] == 'W':  # move west (left)
-            # move one step
-            if i - 1 >= 0 and state[i - 1] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i - 1] = new_state[i - 1], new_state[i]
-                moves.append(''.join(new_state))
-            # jump over one rabbit
-            if i - 2 >= 0 and state[i - 1] in ['E'] and state[i - 2] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i - 2] = new_state[i - 2], new_state[i]
-                moves.append(''.join(new_state))
-    return moves
+from search_core import (PackedRabbitLeapProblem, RabbitLeapProblem,  # noqa: F401
+                         decode_state, encode_state, packed_moves, reverse_moves, solve)
+
+# The searches themselves live in search_core; these keep the old
+# start/goal string interface.
 
 
 def bfs(start, goal):
-    queue = deque([[start]])
-    visited = set([start])
-
-    while queue:
-        path = queue.popleft()
-        state = path[-1]
-        if state == goal:
-            return path
-
-        for move in possible_moves(state):
-            if move not in visited:
-                visited.add(move)
-                queue.append(path + [move])
-    return None
+    path, _ = solve(RabbitLeapProblem(start, goal), 'bfs')
+    return path
+
+
+def bidirectional_bfs(start, goal):
+    """BFS from both ends at once; returns the same path format as bfs()."""
+    path, _ = solve(RabbitLeapProblem(start, goal), 'bidirectional')
+    return path
+
+
+def bfs_packed(start, goal):
+    """BFS over packed boards; the path is decoded back to strings at the end."""
+    problem = PackedRabbitLeapProblem(start, goal)
+    path, _ = solve(problem, 'bfs')
+    return problem.decode(path)
 
 
 # Initial setup
@@ -1,3 +1,7 @@
+from search_core import RabbitLeapProblem, SearchStats, possible_moves, solve
+from search_core import depth_limited as search_depth_limited
+
+
 def dfs(state, goal, path, visited):
     if state == goal:
         return path + [state]
@@ -13,36 +17,23 @@ def dfs(state, goal, path, visited):
     return None
 
 
-def possible_moves(state):
-    state = list(state)
-    moves = []
-    n = len(state)
-
-    for i in range(n):
-        if state[i] == 'E':  # move east (right)
-            # move one step
-            if i + 1 < n and state[i + 1] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i + 1] = new_state[i + 1], new_state[i]
-                moves.append(''.join(new_state))
-            # jump over one rabbit
-            if i + 2 < n and state[i + 1] in ['W'] and state[i + 2] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i + 2] = new_state[i + 2], new_state[i]
-                moves.append(''.join(new_state))
-
-        elif state[i] == 'W':  # move west (left)
-            # move one step
-            if i - 1 >= 0 and state[i - 1] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i - 1] = new_state[i - 1], new_state[i]
-                moves.append(''.join(new_state))
-            # jump over one rabbit
-            if i - 2 >= 0 and state[i - 1] in ['E'] and state[i - 2] == '_':
-                new_state = state.copy()
-                new_state[i], new_state[i - 2] = new_state[i - 2], new_state[i]
-                moves.append(''.join(new_state))
-    return moves
+# Stack-based DFS and iterative deepening come from search_core; these keep
+# the old start/goal string interface. order_moves(state, moves) may reorder
+# the successors of every state.
+def dfs_iterative(start, goal, order_moves=None):
+    path, _ = solve(RabbitLeapProblem(start, goal, order_moves), 'dfs')
+    return path
+
+
+def depth_limited(start, goal, limit, path, order_moves=None):
+    """DFS to depth `limit` reusing `path`; returns (path or None, cutoff)."""
+    problem = RabbitLeapProblem(start, goal, order_moves)
+    return search_depth_limited(problem, limit, path, SearchStats('iddfs'))
+
+
+def iddfs(start, goal, max_depth=None, order_moves=None):
+    path, _ = solve(RabbitLeapProblem(start, goal, order_moves), 'iddfs', max_depth=max_depth)
+    return path
 
 
 # Initial setup
@@ -0,0 +1,545 @@
+import heapq
+import time
+import tracemalloc
+from collections import deque
+from itertools import count
+
+# -----------------------
+# Problem interface
+# -----------------------
+
+class SearchProblem:
+    """Base class for puzzles solved by the strategies below."""
+
+    def initial_state(self):
+        raise NotImplementedError
+
+    def successors(self, state):
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        raise NotImplementedError
+
+    def goal_state(self):
+        """The single goal state; only needed for bidirectional search."""
+        raise NotImplementedError
+
+    def predecessors(self, state):
+        """States that reach `state` in one move; only needed for bidirectional search."""
+        raise NotImplementedError
+
+    def heuristic(self, state):
+        """Estimated moves to the goal; 0 turns A* into uniform-cost search."""
+        return 0
+
+
+def possible_moves(state):
+    state = list(state)
+    moves = []
+    n = len(state)
+
+    for i in range(n):
+        if state[i] == 'E':  # move east (right)
+            # move one step
+            if i + 1 < n and state[i + 1] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i + 1] = new_state[i + 1], new_state[i]
+                moves.append(''.join(new_state))
+            # jump over one rabbit
+            if i + 2 < n and state[i + 1] in ['W'] and state[i + 2] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i + 2] = new_state[i + 2], new_state[i]
+                moves.append(''.join(new_state))
+
+        elif state[i] == 'W':  # move west (left)
+            # move one step
+            if i - 1 >= 0 and state[i - 1] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i - 1] = new_state[i - 1], new_state[i]
+                moves.append(''.join(new_state))
+            # jump over one rabbit
+            if i - 2 >= 0 and state[i - 1] in ['E'] and state[i - 2] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i - 2] = new_state[i - 2], new_state[i]
+                moves.append(''.join(new_state))
+    return moves
+
+
+def reverse_moves(state):
+    """Boards that reach `state` in one move (mirror of possible_moves())."""
+    state = list(state)
+    moves = []
+    n = len(state)
+
+    for i in range(n):
+        if state[i] == 'E':  # undo a move east
+            # came one step from the left
+            if i - 1 >= 0 and state[i - 1] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i - 1] = new_state[i - 1], new_state[i]
+                moves.append(''.join(new_state))
+            # jumped over one rabbit from the left
+            if i - 2 >= 0 and state[i - 1] in ['W'] and state[i - 2] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i - 2] = new_state[i - 2], new_state[i]
+                moves.append(''.join(new_state))
+
+        elif state[i] == 'W':  # undo a move west
+            # came one step from the right
+            if i + 1 < n and state[i + 1] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i + 1] = new_state[i + 1], new_state[i]
+                moves.append(''.join(new_state))
+            # jumped over one rabbit from the right
+            if i + 2 < n and state[i + 1] in ['E'] and state[i + 2] == '_':
+                new_state = state.copy()
+                new_state[i], new_state[i + 2] = new_state[i + 2], new_state[i]
+                moves.append(''.join(new_state))
+    return moves
+
+
+class RabbitLeapProblem(SearchProblem):
+    """Boards as strings. order_moves(state, moves) may reorder successors."""
+
+    def __init__(self, start, goal, order_moves=None):
+        self.start = start
+        self.goal = goal
+        self.order_moves = order_moves
+
+    def initial_state(self):
+        return self.start
+
+    def successors(self, state):
+        moves = possible_moves(state)
+        if self.order_moves is not None:
+            moves = self.order_moves(state, moves)
+        return moves
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def goal_state(self):
+        return self.goal
+
+    def predecessors(self, state):
+        return reverse_moves(state)
+
+    def heuristic(self, state):
+        # a move changes exactly two cells, so this never overestimates
+        mismatched = sum(1 for a, b in zip(state, self.goal) if a != b)
+        return (mismatched + 1) // 2
+
+
+# Packed boards: 2 bits per cell, so states are small ints instead of strings
+EMPTY, EAST, WEST = 0, 1, 2
+CELL_CODES = {'_': EMPTY, 'E': EAST, 'W': WEST}
+CELL_CHARS = '_EW'
+
+
+def encode_state(state):
+    """Pack a board string into an int, cell i occupying bits 2i..2i+1."""
+    code = 0
+    for i, ch in enumerate(state):
+        code |= CELL_CODES[ch] << (2 * i)
+    return code
+
+
+def decode_state(code, n):
+    """Unpack an int produced by encode_state() back into a board string."""
+    return ''.join(CELL_CHARS[(code >> (2 * i)) & 3] for i in range(n))
+
+
+def packed_moves(code, n):
+    """Same successors as possible_moves(), but on packed boards.
+
+    Every move fills an empty cell, so we only look around the blanks and
+    move a rabbit by XOR-ing it out of its old cell and into the blank.
+    """
+    moves = []
+    for i in range(n):
+        shift = 2 * i
+        if (code >> shift) & 3 != EMPTY:
+            continue
+        # an 'E' steps or jumps in from the left
+        if i >= 1 and (code >> (shift - 2)) & 3 == EAST:
+            moves.append(code ^ (EAST << (shift - 2)) ^ (EAST << shift))
+        if i >= 2 and (code >> (shift - 4)) & 3 == EAST and (code >> (shift - 2)) & 3 == WEST:
+            moves.append(code ^ (EAST << (shift - 4)) ^ (EAST << shift))
+        # a 'W' steps or jumps in from the right
+        if i + 1 < n and (code >> (shift + 2)) & 3 == WEST:
+            moves.append(code ^ (WEST << (shift + 2)) ^ (WEST << shift))
+        if i + 2 < n and (code >> (shift + 4)) & 3 == WEST and (code >> (shift + 2)) & 3 == EAST:
+            moves.append(code ^ (WEST << (shift + 4)) ^ (WEST << shift))
+    return moves
+
+
+def packed_reverse_moves(code, n):
+    """Same predecessors as reverse_moves(), but on packed boards.
+
+    Undoing a move puts a rabbit back into the cell it left, which is empty
+    now, so again we only look around the blanks.
+    """
+    moves = []
+    for i in range(n):
+        shift = 2 * i
+        if (code >> shift) & 3 != EMPTY:
+            continue
+        # an 'E' to the right stepped or jumped from here
+        if i + 1 < n and (code >> (shift + 2)) & 3 == EAST:
+            moves.append(code ^ (EAST << (shift + 2)) ^ (EAST << shift))
+        if i + 2 < n and (code >> (shift + 4)) & 3 == EAST and (code >> (shift + 2)) & 3 == WEST:
+            moves.append(code ^ (EAST << (shift + 4)) ^ (EAST << shift))
+        # a 'W' to the left stepped or jumped from here
+        if i >= 1 and (code >> (shift - 2)) & 3 == WEST:
+            moves.append(code ^ (WEST << (shift - 2)) ^ (WEST << shift))
+        if i >= 2 and (code >> (shift - 4)) & 3 == WEST and (code >> (shift - 2)) & 3 == EAST:
+            moves.append(code ^ (WEST << (shift - 4)) ^ (WEST << shift))
+    return moves
+
+
+class PackedRabbitLeapProblem(SearchProblem):
+    """RabbitLeapProblem on packed int boards; decode() turns a path back into strings."""
+
+    def __init__(self, start, goal):
+        self.n = len(start)
+        self.start = encode_state(start)
+        self.goal = encode_state(goal)
+        self.low_bits = int('01' * self.n, 2)  # bit 0 of every cell
+
+    def initial_state(self):
+        return self.start
+
+    def successors(self, state):
+        return packed_moves(state, self.n)
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def goal_state(self):
+        return self.goal
+
+    def predecessors(self, state):
+        return packed_reverse_moves(state, self.n)
+
+    def heuristic(self, state):
+        diff = state ^ self.goal
+        mismatched = bin((diff | (diff >> 1)) & self.low_bits).count('1')
+        return (mismatched + 1) // 2
+
+    def decode(self, path):
+        return None if path is None else [decode_state(code, self.n) for code in path]
+
+
+def rabbit_leap_instance(n_east, n_west=None, gap=1):
+    """Board with n_east 'E' rabbits, n_west 'W' rabbits and `gap` empty cells."""
+    if n_west is None:
+        n_west = n_east
+    start = 'E' * n_east + '_' * gap + 'W' * n_west
+    goal = 'W' * n_west + '_' * gap + 'E' * n_east
+    return RabbitLeapProblem(start, goal)
+
+
+# -----------------------
+# Statistics
+# -----------------------
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchStats:
+    def __init__(self, strategy, time_limit=None):
+        self.strategy = strategy
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.timed_out = False
+        self.expansions = 0
+        self.peak_frontier = 0
+        self.peak_memory = None  # bytes, only when memory tracking is on
+        self.elapsed = 0.0
+        self.path_length = None
+
+    def expand(self):
+        """Count one expansion; checks the time limit every 1024 of them."""
+        self.expansions += 1
+        if self.deadline is not None and not self.expansions & 1023 \
+                and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def see_frontier(self, size):
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def as_dict(self):
+        return {
+            'strategy': self.strategy,
+            'expansions': self.expansions,
+            'peak_frontier': self.peak_frontier,
+            'peak_memory': self.peak_memory,
+            'elapsed': self.elapsed,
+            'path_length': self.path_length,
+            'timed_out': self.timed_out,
+        }
+
+
+# -----------------------
+# Strategies
+# -----------------------
+
+def _rebuild(parent, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parent[state]
+    return path[::-1]
+
+
+def bfs(problem, stats):
+    start = problem.initial_state()
+    parent = {start: None}
+    queue = deque([start])
+
+    while queue:
+        stats.see_frontier(len(queue))
+        state = queue.popleft()
+        if problem.is_goal(state):
+            return _rebuild(parent, state)
+
+        stats.expand()
+        for move in problem.successors(state):
+            if move not in parent:
+                parent[move] = state
+                queue.append(move)
+    return None
+
+
+def dfs(problem, stats):
+    start = problem.initial_state()
+    path = [start]
+    if problem.is_goal(start):
+        return path[:]
+
+    visited = {start}
+    stack = [iter(problem.successors(start))]
+    stats.expand()
+    while stack:
+        stats.see_frontier(len(stack))
+        move = next(stack[-1], None)
+        if move is None:
+            stack.pop()
+            path.pop()
+            continue
+        if move in visited:
+            continue
+        visited.add(move)
+        path.append(move)
+        if problem.is_goal(move):
+            return path[:]
+        stats.expand()
+        stack.append(iter(problem.successors(move)))
+    return None
+
+
+def depth_limited(problem, limit, path, stats):
+    """DFS to depth `limit` reusing `path`; returns (path or None, cutoff)."""
+    start = problem.initial_state()
+    del path[:]
+    path.append(start)
+    if problem.is_goal(start):
+        return path[:], False
+    if limit == 0:
+        return None, True
+
+    on_path = {start}
+    cutoff = False
+    stack = [iter(problem.successors(start))]
+    stats.expand()
+    while stack:
+        stats.see_frontier(len(stack))
+        move = next(stack[-1], None)
+        if move is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if move in on_path:
+            continue
+        path.append(move)
+        if problem.is_goal(move):
+            return path[:], cutoff
+        if len(path) - 1 < limit:
+            on_path.add(move)
+            stats.expand()
+            stack.append(iter(problem.successors(move)))
+        else:
+            cutoff = True
+            path.pop()
+    return None, cutoff
+
+
+def iddfs(problem, stats, max_depth=None):
+    path = []
+    depth = 0
+    while max_depth is None or depth <= max_depth:
+        result, cutoff = depth_limited(problem, depth, path, stats)
+        if result is not None:
+            return result
+        if not cutoff:
+            return None
+        depth += 1
+    return None
+
+
+def bidirectional(problem, stats):
+    """BFS from both ends, growing the smaller frontier one level at a time.
+
+    Needs problem.goal_state() and problem.predecessors().
+    """
+    start, goal = problem.initial_state(), problem.goal_state()
+    if start == goal:
+        return [start]
+
+    fwd_parent = {start: None}
+    bwd_parent = {goal: None}
+    fwd_frontier = [start]
+    bwd_frontier = [goal]
+
+    while fwd_frontier and bwd_frontier:
+        stats.see_frontier(len(fwd_frontier) + len(bwd_frontier))
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        if forward:
+            frontier, parent, other, expand = fwd_frontier, fwd_parent, bwd_parent, problem.successors
+        else:
+            frontier, parent, other, expand = bwd_frontier, bwd_parent, fwd_parent, problem.predecessors
+
+        next_frontier = []
+        for state in frontier:
+            stats.expand()
+            for move in expand(state):
+                if move in parent:
+                    continue
+                parent[move] = state
+                if move in other:
+                    # the two searches have met
+                    return _join_paths(move, fwd_parent, bwd_parent)
+                next_frontier.append(move)
+
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+    return None
+
+
+def _join_paths(meet, fwd_parent, bwd_parent):
+    path = _rebuild(fwd_parent, meet)
+    state = bwd_parent[meet]
+    while state is not None:
+        path.append(state)
+        state = bwd_parent[state]
+    return path
+
+
+def _best_first(problem, stats, priority):
+    start = problem.initial_state()
+    tie = count()  # keeps heap order stable without comparing states
+    parent = {start: None}
+    g_score = {start: 0}
+    pq = [(priority(0, start), next(tie), 0, start)]
+
+    while pq:
+        stats.see_frontier(len(pq))
+        _, _, g, state = heapq.heappop(pq)
+        if g > g_score[state]:
+            continue  # stale entry
+        if problem.is_goal(state):
+            return _rebuild(parent, state)
+
+        stats.expand()
+        for move in problem.successors(state):
+            new_g = g + 1
+            if move not in g_score or new_g < g_score[move]:
+                g_score[move] = new_g
+                parent[move] = state
+                heapq.heappush(pq, (priority(new_g, move), next(tie), new_g, move))
+    return None
+
+
+def astar(problem, stats):
+    return _best_first(problem, stats, lambda g, state: g + problem.heuristic(state))
+
+
+def greedy(problem, stats):
+    return _best_first(problem, stats, lambda g, state: problem.heuristic(state))
+
+
+STRATEGIES = {
+    'bfs': bfs,
+    'bidirectional': bidirectional,
+    'dfs': dfs,
+    'iddfs': iddfs,
+    'astar': astar,
+    'greedy': greedy,
+}
+
+
+def solve(problem, strategy='bfs', track_memory=False, time_limit=None, **options):
+    """Run one strategy on a problem; returns (path or None, SearchStats).
+
+    Extra options go to the strategy (e.g. max_depth for iddfs). A run that
+    exceeds `time_limit` seconds returns None with stats.timed_out set.
+    """
+    stats = SearchStats(strategy, time_limit)
+    search = STRATEGIES[strategy]
+
+    if track_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    path = None
+    try:
+        path = search(problem, stats, **options)
+    except SearchTimeout:
+        stats.timed_out = True
+    finally:
+        stats.elapsed = time.perf_counter() - t0
+        if track_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    stats.path_length = len(path) - 1 if path else None
+    return path, stats
+
+
+def benchmark(instances, strategies=None, track_memory=False, time_limit=5.0):
+    """Run every strategy on every (name, problem) pair; returns a list of dicts.
+
+    Each run is capped at `time_limit` seconds (None for no cap), so one
+    exploding strategy such as IDDFS on a wide board does not stall the rest.
+    """
+    if strategies is None:
+        strategies = list(STRATEGIES)
+    results = []
+    for name, problem in instances:
+        for strategy in strategies:
+            _, stats = solve(problem, strategy, track_memory=track_memory, time_limit=time_limit)
+            row = stats.as_dict()
+            row['instance'] = name
+            results.append(row)
+    return results
+
+
+# -----------------------
+# Example Usage
+# -----------------------
+
+if __name__ == "__main__":
+    instances = []
+    for n in range(2, 6):
+        instances.append((f"{n}x{n} gap=1", rabbit_leap_instance(n)))
+    instances.append(("2x2 gap=2", rabbit_leap_instance(2, gap=2)))
+    instances.append(("3x3 gap=2", rabbit_leap_instance(3, gap=2)))
+
+    for row in benchmark(instances, track_memory=True, time_limit=2.0):
+        length = 'timeout' if row['timed_out'] else row['path_length']
+        print(f"{row['instance']:<12} {row['strategy']:<13} "
+              f"len={length} expanded={row['expansions']} "
+              f"frontier={row['peak_frontier']} mem={row['peak_memory']}B "
+              f"time={row['elapsed']:.4f}s")
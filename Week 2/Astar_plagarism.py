@@ -1,6 +1,24 @@
+import codecs
 import heapq
+import itertools
+import json
+import math
+import mmap
+import os
 import re
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from difflib import SequenceMatcher
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # fall back to dense n-gram matrices
+    sparse = None
 
 # -----------------------
 # Utility functions
@@ -8,25 +26,198 @@ from difflib import SequenceMatcher
 
 def sentence_tokenize(text):
     """Split text into sentences using basic punctuation rules."""
-    return [s.strip() for s in re.split(r'(?<=[.!?]) +', text) if s.strip()]
+    return [s.strip() for s in SENTENCE_BREAK.split(text) if s.strip()]
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?]) +')
+
+
+def _text_chunks(path, chunk_size, use_mmap, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, len(mm), chunk_size):
+                    yield decoder.decode(mm[start:start + chunk_size])
+        else:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_sentences(path, chunk_size=1 << 20, use_mmap=False, encoding="utf-8"):
+    """Streaming sentence_tokenize() over a file, read `chunk_size` bytes at a time.
+
+    Text after the last sentence break of a chunk is carried into the next
+    one, so sentences spanning chunk boundaries come out whole. The carry
+    holds no break, so only its last character (a possible '.') is scanned
+    again; memory is bounded by the longest sentence.
+    """
+    carry = []  # pieces of the sentence in progress
+    tail = ""
+    for text in _text_chunks(path, chunk_size, use_mmap, encoding):
+        parts = SENTENCE_BREAK.split(tail + text)
+        carry.append(parts[0][len(tail):])
+        if len(parts) > 1:
+            for part in ["".join(carry)] + parts[1:-1]:
+                part = part.strip()
+                if part:
+                    yield part
+            carry = [parts[-1]]
+        tail = parts[-1][-1:]
+    carry = "".join(carry).strip()
+    if carry:
+        yield carry
 
 def similarity(a, b):
     """Compute a simple similarity score between two sentences (0–1)."""
     return SequenceMatcher(None, a, b).ratio()
 
 # -----------------------
-# A* Search Implementation
+# Similarity backends
 # -----------------------
 
-class Node:
-    def __init__(self, i, j, cost, path):
-        self.i = i  # position in doc1
-        self.j = j  # position in doc2
-        self.cost = cost
-        self.path = path  # alignment path (list of tuples)
+def char_ngrams(sentence, n=3):
+    """Character n-grams of a lower-cased, space-padded sentence."""
+    padded = f" {sentence.lower()} "
+    if len(padded) < n:
+        return [padded]
+    return [padded[k:k + n] for k in range(len(padded) - n + 1)]
+
+
+def _ngram_triplets(docs, n, vocab):
+    rows, cols, counts = [], [], []
+    for r, sentence in enumerate(docs):
+        for gram, c in Counter(char_ngrams(sentence, n)).items():
+            rows.append(r)
+            cols.append(vocab.setdefault(gram, len(vocab)))
+            counts.append(c)
+    return rows, cols, counts
+
+
+def _ngram_matrix(triplets, n_rows, n_cols, binary=False):
+    rows, cols, counts = triplets
+    values = np.ones(len(counts), dtype=np.float32) if binary else np.asarray(counts, dtype=np.float32)
+    if sparse is not None:
+        return sparse.csr_matrix((values, (rows, cols)), shape=(n_rows, n_cols))
+    matrix = np.zeros((n_rows, n_cols), dtype=np.float32)
+    matrix[rows, cols] = values
+    return matrix
+
+
+def _pairwise_dot(A, B):
+    product = A @ B.T
+    if sparse is not None and sparse.issparse(product):
+        product = product.toarray()
+    return np.asarray(product, dtype=np.float32)
+
+
+def _row_sums(A):
+    return np.asarray(A.sum(axis=1), dtype=np.float32).ravel()
+
+
+def similarity_matrix(doc1, doc2, method="cosine", n=3):
+    """Score every (doc1[i], doc2[j]) pair in one batch; returns a (len1, len2) array.
+
+    "cosine" compares character n-gram count vectors, "jaccard" compares the
+    n-gram sets, and "exact" runs SequenceMatcher on every pair.
+    """
+    len1, len2 = len(doc1), len(doc2)
+    if method == "exact":
+        matrix = np.zeros((len1, len2), dtype=np.float32)
+        for i, a in enumerate(doc1):
+            for j, b in enumerate(doc2):
+                matrix[i, j] = similarity(a, b)
+        return matrix
+    if method not in ("cosine", "jaccard"):
+        raise ValueError(f"unknown similarity method: {method!r}")
+    if len1 == 0 or len2 == 0:
+        return np.zeros((len1, len2), dtype=np.float32)
+
+    A, B, s1, s2 = _ngram_operands(doc1, doc2, method, n)
+    return _normalize(_pairwise_dot(A, B), s1[:, None], s2[None, :], method)
+
+
+def _ngram_operands(doc1, doc2, method, n):
+    """N-gram matrices for both documents plus per-row norms (cosine) or set sizes (jaccard)."""
+    vocab = {}
+    t1 = _ngram_triplets(doc1, n, vocab)
+    t2 = _ngram_triplets(doc2, n, vocab)
+    binary = (method == "jaccard")
+    A = _ngram_matrix(t1, len(doc1), len(vocab), binary)
+    B = _ngram_matrix(t2, len(doc2), len(vocab), binary)
+    if binary:
+        return A, B, _row_sums(A), _row_sums(B)
+    sq1 = A.multiply(A) if sparse is not None else A * A
+    sq2 = B.multiply(B) if sparse is not None else B * B
+    return A, B, np.sqrt(_row_sums(sq1)), np.sqrt(_row_sums(sq2))
+
+
+def _normalize(dot, s1, s2, method):
+    if method == "jaccard":
+        # |a ∩ b| / |a ∪ b|
+        denom = s1 + s2 - dot
+    else:
+        denom = s1 * s2
+    sim = np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+    # float32 rounding can land just above 1, which would make 1 - sim negative
+    return np.clip(sim, 0.0, 1.0, out=sim)
+
+
+def make_scorer(doc1, doc2, backend="exact"):
+    """Return score(i, j) for the aligner.
+
+    "exact" scores pairs lazily with SequenceMatcher and memoizes them; any
+    other backend precomputes the full matrix so the search only does lookups.
+    """
+    if backend == "exact":
+        cache = {}
+
+        def score(i, j):
+            key = (i, j)
+            if key not in cache:
+                cache[key] = similarity(doc1[i], doc2[j])
+            return cache[key]
+        return score
+
+    matrix = similarity_matrix(doc1, doc2, method=backend)
+    return lambda i, j: matrix.item(i, j)
 
-    def __lt__(self, other):
-        return self.cost < other.cost
+
+class RowScorer:
+    """Scores doc1[i] against a slice of doc2 without building the full matrix.
+
+    Used by the banded and linear-space aligners, which only ever need one
+    row segment at a time. N-gram backends keep just the per-sentence vectors.
+    """
+
+    def __init__(self, doc1, doc2, backend="exact", n=3):
+        self.doc1 = doc1
+        self.doc2 = doc2
+        self.backend = backend
+        if backend != "exact":
+            if backend not in ("cosine", "jaccard"):
+                raise ValueError(f"unknown similarity method: {backend!r}")
+            self.A, self.B, self.s1, self.s2 = _ngram_operands(doc1, doc2, backend, n)
+
+    def row(self, i, lo, hi):
+        """Similarities of doc1[i] with doc2[lo:hi] as a float64 array."""
+        if self.backend == "exact":
+            a = self.doc1[i]
+            return np.array([similarity(a, b) for b in self.doc2[lo:hi]], dtype=np.float64)
+        if hi <= lo:
+            return np.zeros(0, dtype=np.float64)
+        dot = _pairwise_dot(self.A[i:i + 1], self.B[lo:hi])[0]
+        return _normalize(dot, self.s1[i], self.s2[lo:hi], self.backend).astype(np.float64)
+
+    def pair(self, i, j):
+        return float(self.row(i, j, j + 1)[0])
+
+# -----------------------
+# A* Search Implementation
+# -----------------------
+
+# Back-pointer codes: which move reached a cell
+NO_MOVE, MATCH, SKIP1, SKIP2 = 0, 1, 2, 3
 
 
 def heuristic(i, j, len1, len2):
@@ -34,56 +225,396 @@ def heuristic(i, j, len1, len2):
     return abs((len1 - i) - (len2 - j))
 
 
-def a_star_align(doc1, doc2):
+def a_star_align(doc1, doc2, backend="exact"):
     len1, len2 = len(doc1), len(doc2)
-    start = Node(0, 0, 0, [])
-    pq = [(0, start)]
+    score = make_scorer(doc1, doc2, backend)
+    width = len2 + 1
 
-    visited = set()
+    # Dense g-scores and back-pointers over the (len1+1) x (len2+1) grid,
+    # indexed by i * width + j; heap entries are plain (f, g, i, j) tuples.
+    g_score = array('d', [math.inf]) * ((len1 + 1) * width)
+    back = bytearray((len1 + 1) * width)
+
+    g_score[0] = 0.0
+    pq = [(heuristic(0, 0, len1, len2), 0.0, 0, 0)]
 
     while pq:
-        _, node = heapq.heappop(pq)
-        i, j = node.i, node.j
+        _, g, i, j = heapq.heappop(pq)
 
-        if (i, j) in visited:
+        # Skip stale entries that were improved after being pushed
+        if g > g_score[i * width + j]:
             continue
-        visited.add((i, j))
 
         # If we reached the end of both documents
         if i == len1 and j == len2:
-            return node.path
+            return _rebuild_alignment(doc1, doc2, back, width, score)
 
         # Explore next states
         if i < len1 and j < len2:
-            sim = similarity(doc1[i], doc2[j])
+            sim = score(i, j)
             # Lower cost means higher similarity
-            cost = node.cost + (1 - sim)
-            new_path = node.path + [((i, doc1[i]), (j, doc2[j]), sim)]
-            heapq.heappush(pq, (cost + heuristic(i + 1, j + 1, len1, len2),
-                                 Node(i + 1, j + 1, cost, new_path)))
+            _relax(pq, g_score, back, width, i + 1, j + 1, g + (1 - sim), MATCH, len1, len2)
 
         # Skip a sentence from doc1
         if i < len1:
-            heapq.heappush(pq, (node.cost + 1 + heuristic(i + 1, j, len1, len2),
-                                 Node(i + 1, j, node.cost + 1, node.path)))
+            _relax(pq, g_score, back, width, i + 1, j, g + 1, SKIP1, len1, len2)
 
         # Skip a sentence from doc2
         if j < len2:
-            heapq.heappush(pq, (node.cost + 1 + heuristic(i, j + 1, len1, len2),
-                                 Node(i, j + 1, node.cost + 1, node.path)))
+            _relax(pq, g_score, back, width, i, j + 1, g + 1, SKIP2, len1, len2)
 
     return []
 
 
+def _relax(pq, g_score, back, width, i, j, cost, move, len1, len2):
+    idx = i * width + j
+    if cost < g_score[idx]:
+        g_score[idx] = cost
+        back[idx] = move
+        heapq.heappush(pq, (cost + heuristic(i, j, len1, len2), cost, i, j))
+
+
+def _rebuild_alignment(doc1, doc2, back, width, score):
+    """Walk the back-pointers from the goal; only matched pairs are reported."""
+    path = []
+    i, j = len(doc1), len(doc2)
+    while i > 0 or j > 0:
+        move = back[i * width + j]
+        if move == MATCH:
+            i, j = i - 1, j - 1
+            path.append(((i, doc1[i]), (j, doc2[j]), score(i, j)))
+        elif move == SKIP1:
+            i -= 1
+        else:
+            j -= 1
+    path.reverse()
+    return path
+
+
+# -----------------------
+# Banded and linear-space alignment
+# -----------------------
+# Both solve the recurrence the A* search explores, one row at a time:
+#   D[i][j] = min(D[i-1][j-1] + 1 - sim, D[i-1][j] + 1, D[i][j-1] + 1)
+# The "skip doc2" term chains along the row, but since it always costs 1 it
+# reduces to D[j] = min_k (C[k] + j - k), i.e. a running minimum of C[k] - k.
+
+def _dp_step(above, diag_prev, sims):
+    """One DP row over a contiguous j range.
+
+    above[k] and diag_prev[k] are D[i-1][j] and D[i-1][j-1] for the k-th
+    column (inf when outside the previous row), sims[k] the matching
+    similarity. Returns the row and its MATCH/SKIP1/SKIP2 back-pointers.
+    """
+    diag = diag_prev + 1 - sims
+    up = above + 1
+    cand = np.minimum(diag, up)
+
+    offsets = np.arange(len(cand), dtype=np.float64)
+    row = offsets + np.minimum.accumulate(cand - offsets)
+    from_left = np.zeros(len(cand), dtype=bool)
+    from_left[1:] = row[:-1] + 1 < cand[1:]
+    row[1:] = np.where(from_left[1:], row[:-1] + 1, cand[1:])
+    row[0] = cand[0]
+
+    choice = np.where(from_left, SKIP2, np.where(diag <= up, MATCH, SKIP1)).astype(np.uint8)
+    return row, choice
+
+
+def _full_row(scorer, prev, i, j_lo, j_hi):
+    """D row for doc1[i] over columns j_lo..j_hi of a sub-problem starting at j_lo."""
+    diag_prev = np.concatenate(([math.inf], prev[:-1]))
+    sims = np.concatenate(([0.0], scorer.row(i, j_lo, j_hi)))
+    return _dp_step(prev, diag_prev, sims)
+
+
+def _band_limits(i, len1, len2, band):
+    center = i * len2 / len1
+    return max(0, math.ceil(center - band)), min(len2, math.floor(center + band))
+
+
+def banded_align(doc1, doc2, band=50, backend="exact"):
+    """Align within a diagonal band of half-width `band` around j = i * len2 / len1.
+
+    Memory is O(len1 * band). The band is widened to the documents' length
+    ratio so consecutive rows always overlap. Pairs outside the band are
+    never scored, so the result is optimal only if the best alignment stays
+    inside it.
+    """
+    len1, len2 = len(doc1), len(doc2)
+    if len1 == 0:
+        return []
+    band = max(band, math.ceil(len2 / len1) + 1)
+    scorer = RowScorer(doc1, doc2, backend)
+
+    lo, hi = _band_limits(0, len1, len2, band)
+    prev = np.arange(lo, hi + 1, dtype=np.float64)  # D[0][j] = j
+    limits = [(lo, hi)]
+    choices = [None]
+
+    for i in range(1, len1 + 1):
+        plo, phi = limits[-1]
+        lo, hi = _band_limits(i, len1, len2, band)
+        width = hi - lo + 1
+
+        # previous row shifted onto this row's columns; inf outside its band
+        above = np.full(width, math.inf)
+        a, b = max(lo, plo), min(hi, phi)
+        if a <= b:
+            above[a - lo:b - lo + 1] = prev[a - plo:b - plo + 1]
+        diag_prev = np.full(width, math.inf)
+        a, b = max(lo, plo + 1), min(hi, phi + 1)
+        if a <= b:
+            diag_prev[a - lo:b - lo + 1] = prev[a - 1 - plo:b - plo]
+
+        sims = np.zeros(width)
+        s_lo = max(lo, 1)
+        sims[s_lo - lo:] = scorer.row(i - 1, s_lo - 1, hi)
+
+        prev, choice = _dp_step(above, diag_prev, sims)
+        limits.append((lo, hi))
+        choices.append(choice)
+
+    path = []
+    i, j = len1, len2
+    while i > 0 or j > 0:
+        move = choices[i][j - limits[i][0]] if i > 0 else SKIP2
+        if move == MATCH:
+            i, j = i - 1, j - 1
+            path.append(((i, doc1[i]), (j, doc2[j]), scorer.pair(i, j)))
+        elif move == SKIP1:
+            i -= 1
+        else:
+            j -= 1
+    path.reverse()
+    return path
+
+
+def _last_row(scorer, i_lo, i_hi, j_lo, j_hi, reverse=False):
+    """Costs D[i_hi][*] of aligning doc1[i_lo:i_hi] with every prefix of doc2[j_lo:j_hi].
+
+    With reverse=True it is the cost of every suffix instead, aligned
+    against doc1[i_lo:i_hi] from the end; the row is returned in j order.
+    """
+    row = np.arange(j_hi - j_lo + 1, dtype=np.float64)
+    rows = range(i_hi - 1, i_lo - 1, -1) if reverse else range(i_lo, i_hi)
+    for i in rows:
+        if reverse:
+            sims = np.concatenate(([0.0], scorer.row(i, j_lo, j_hi)[::-1]))
+            diag_prev = np.concatenate(([math.inf], row[:-1]))
+            row, _ = _dp_step(row, diag_prev, sims)
+        else:
+            row, _ = _full_row(scorer, row, i, j_lo, j_hi)
+    return row[::-1] if reverse else row
+
+
+def hirschberg_align(doc1, doc2, backend="exact"):
+    """Optimal alignment in O(len1 + len2) memory (Hirschberg's divide and conquer).
+
+    Returns the same cost as a_star_align(), at the price of rescoring each
+    pair about twice.
+    """
+    scorer = RowScorer(doc1, doc2, backend)
+    pairs = []
+    stack = [(0, len(doc1), 0, len(doc2))]
+
+    while stack:
+        i_lo, i_hi, j_lo, j_hi = stack.pop()
+        if i_lo == i_hi or j_lo == j_hi:
+            continue
+        if i_hi - i_lo == 1:
+            # a match costs at most 1 + (m - 1), skipping everything 1 + m
+            sims = scorer.row(i_lo, j_lo, j_hi)
+            k = int(np.argmax(sims))
+            pairs.append((i_lo, j_lo + k, float(sims[k])))
+            continue
+
+        mid = (i_lo + i_hi) // 2
+        forward = _last_row(scorer, i_lo, mid, j_lo, j_hi)
+        backward = _last_row(scorer, mid, i_hi, j_lo, j_hi, reverse=True)
+        split = j_lo + int(np.argmin(forward + backward))
+        # right half first so the left half is popped (and emitted) first
+        stack.append((mid, i_hi, split, j_hi))
+        stack.append((i_lo, mid, j_lo, split))
+
+    return [((i, doc1[i]), (j, doc2[j]), sim) for i, j, sim in pairs]
+
+
+def align(doc1, doc2, mode="astar", backend="exact", band=50):
+    """Dispatch to the A* ("astar"), "banded" or "hirschberg" aligner."""
+    if mode == "astar":
+        return a_star_align(doc1, doc2, backend=backend)
+    if mode == "banded":
+        return banded_align(doc1, doc2, band=band, backend=backend)
+    if mode == "hirschberg":
+        return hirschberg_align(doc1, doc2, backend=backend)
+    raise ValueError(f"unknown alignment mode: {mode!r}")
+
+
+def overlap_align(doc1, doc2, open1=True, open2=True, backend="exact"):
+    """Alignment whose unaligned tail on one side is free.
+
+    Used for windows cut out of longer streams: with open1 the alignment
+    may stop once doc2 is used up, leaving the rest of doc1 unaligned at no
+    cost (its counterpart may come later in stream 2), and open2 is the
+    same for doc2. Without that, a shift inside the window would have to
+    pay for skipping the tail it pushes out, and pairing unrelated
+    sentences would look cheaper. Back-pointers take len1 * len2 bytes.
+    """
+    len1, len2 = len(doc1), len(doc2)
+    scorer = RowScorer(doc1, doc2, backend)
+    row = np.arange(len2 + 1, dtype=np.float64)  # D[0][j] = j
+    choices = [np.full(len2 + 1, SKIP2, dtype=np.uint8)]
+    last_col = [row[-1]]
+    for i in range(len1):
+        row, choice = _full_row(scorer, row, i, 0, len2)
+        choices.append(choice)
+        last_col.append(row[-1])
+
+    # candidate end cells: (len1, len2), plus (i, len2) / (len1, j) when open
+    end, best = (len1, len2), row[-1]
+    if open1 and len1:
+        i = int(np.argmin(last_col))
+        if last_col[i] < best:
+            end, best = (i, len2), last_col[i]
+    if open2 and len2:
+        j = int(np.argmin(row))
+        if row[j] < best:
+            end, best = (len1, j), row[j]
+
+    path = []
+    i, j = end
+    while i > 0 or j > 0:
+        move = choices[i][j]
+        if move == MATCH:
+            i, j = i - 1, j - 1
+            path.append(((i, doc1[i]), (j, doc2[j]), scorer.pair(i, j)))
+        elif move == SKIP1:
+            i -= 1
+        else:
+            j -= 1
+    path.reverse()
+    return path
+
+
+def align_streams(sentences1, sentences2, window=2000, overlap=200, threshold=0.8,
+                  mode="astar", backend="exact", band=50):
+    """Align two sentence iterators window by window in bounded memory.
+
+    Each step aligns up to `window` buffered sentences from both streams
+    with overlap_align(), so a shift inside the window is not mistaken for
+    a run of unrelated pairs. Only pairs with similarity >= `threshold`
+    (anchors) are trusted: the buffers advance just past the last anchor
+    before the final `overlap` sentences of both windows, and everything
+    after it is aligned again with the next window. Without such an anchor
+    they advance to the first anchor (up to the cut), or to the cut when
+    the window has none. The last window, once both streams have ended, is
+    aligned with align(mode).
+
+    Yields ((i, s1), (j, s2), sim) tuples with global indices. The pairs
+    at or above `threshold` match a_star_align() as long as inserted or
+    deleted passages are well under `window - overlap` sentences; a longer
+    gap has no anchor in view and may lose pairs around it.
+    """
+    if overlap >= window:
+        raise ValueError("overlap must be smaller than window")
+    sentences1, sentences2 = iter(sentences1), iter(sentences2)
+    buf1, buf2 = [], []
+    base1 = base2 = 0
+
+    while True:
+        buf1.extend(itertools.islice(sentences1, window - len(buf1)))
+        buf2.extend(itertools.islice(sentences2, window - len(buf2)))
+        if not buf1 or not buf2:
+            return
+        # a stream that did not fill its window has ended
+        last1, last2 = len(buf1) < window, len(buf2) < window
+        if last1 and last2:
+            for ((i, s1), (j, s2), sim) in align(buf1, buf2, mode=mode, backend=backend, band=band):
+                yield ((base1 + i, s1), (base2 + j, s2), sim)
+            return
+        cut1 = len(buf1) if last1 else len(buf1) - overlap
+        cut2 = len(buf2) if last2 else len(buf2) - overlap
+
+        # an ended stream's tail can still pair with what the other sends later
+        alignment = overlap_align(buf1, buf2, open1=not last2, open2=not last1, backend=backend)
+        anchors = [(i, j) for (i, _), (j, _), sim in alignment if sim >= threshold]
+        safe = [(i, j) for i, j in anchors if i < cut1 and j < cut2]
+        if safe:
+            adv1, adv2 = safe[-1][0] + 1, safe[-1][1] + 1
+        elif anchors:
+            adv1, adv2 = min(anchors[0][0], cut1), min(anchors[0][1], cut2)
+        else:
+            adv1, adv2 = (0 if last1 else cut1), (0 if last2 else cut2)
+
+        for ((i, s1), (j, s2), sim) in alignment:
+            if i >= adv1 or j >= adv2:
+                break
+            yield ((base1 + i, s1), (base2 + j, s2), sim)
+        del buf1[:adv1]
+        del buf2[:adv2]
+        base1 += adv1
+        base2 += adv2
+
+
+def check_align_streams(backend="cosine", window=100, overlap=40, seed=0):
+    """Regression check: align_streams() finds the above-threshold pairs of a_star_align().
+
+    Runs on generated documents with small offsets and with inserted and
+    deleted passages longer than `overlap`; raises AssertionError on the
+    first case that differs.
+    """
+    import random
+    rng = random.Random(seed)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9)))
+             for _ in range(2000)]
+
+    def sentences(k):
+        return [" ".join(rng.choices(words, k=rng.randint(6, 14))).capitalize() + "."
+                for _ in range(k)]
+
+    base = sentences(400)
+    gap = window - overlap - 10
+    cases = {f"offset {k}": (base, sentences(k) + base) for k in (1, 2, 3)}
+    block = sentences(gap)
+    cases[f"{gap}-sentence insertion"] = (base, base[:150] + block + base[150:])
+    cases[f"{gap}-sentence deletion"] = (base[:150] + block + base[150:], base)
+    cases["insertion and deletion"] = (base[:100] + block + base[100:300],
+                                       base[:250] + block[:gap // 2] + base[250:])
+    for name, (doc1, doc2) in cases.items():
+        full = {(i, j) for (i, _), (j, _), sim in a_star_align(doc1, doc2, backend) if sim >= 0.8}
+        streamed = {(i, j) for (i, _), (j, _), sim in
+                    align_streams(doc1, doc2, window, overlap, backend=backend) if sim >= 0.8}
+        assert streamed == full, f"stream alignment differs on {name}: " \
+                                 f"{len(full - streamed)} missing, {len(streamed - full)} extra"
+
+
 # -----------------------
 # Main Function
 # -----------------------
 
-def detect_plagiarism(text1, text2, threshold=0.8):
+def detect_plagiarism(text1, text2, threshold=0.8, backend="exact", mode="astar"):
     doc1 = sentence_tokenize(text1)
     doc2 = sentence_tokenize(text2)
 
-    alignment = a_star_align(doc1, doc2)
+    alignment = align(doc1, doc2, mode=mode, backend=backend)
+
+    print("\n--- Potentially Plagiarized Sentences ---\n")
+    for ((i, s1), (j, s2), sim) in alignment:
+        if sim >= threshold:
+            print(f"[Doc1: Sentence {i+1}] {s1}")
+            print(f"[Doc2: Sentence {j+1}] {s2}")
+            print(f"→ Similarity: {sim:.2f}")
+            print("-" * 60)
+
+
+def detect_plagiarism_files(path1, path2, threshold=0.8, window=2000, overlap=200,
+                            backend="exact", mode="astar", use_mmap=False):
+    """Streaming detect_plagiarism() for two large text files."""
+    alignment = align_streams(iter_sentences(path1, use_mmap=use_mmap),
+                              iter_sentences(path2, use_mmap=use_mmap),
+                              window=window, overlap=overlap, threshold=threshold,
+                              mode=mode, backend=backend)
 
     print("\n--- Potentially Plagiarized Sentences ---\n")
     for ((i, s1), (j, s2), sim) in alignment:
@@ -94,11 +625,103 @@ def detect_plagiarism(text1, text2, threshold=0.8):
             print("-" * 60)
 
 
+def _align_files(jobs, threshold, backend, mode):
+    """Worker: tokenize and align a chunk of (path1, path2) pairs.
+
+    A pair that fails (unreadable or vanished file, ...) yields one record
+    with an "error" field instead of aborting the rest of the chunk.
+    """
+    records = []
+    for path1, path2 in jobs:
+        base = {"doc1": str(path1), "doc2": str(path2)}
+        try:
+            doc1 = sentence_tokenize(Path(path1).read_text(encoding="utf-8", errors="replace"))
+            doc2 = sentence_tokenize(Path(path2).read_text(encoding="utf-8", errors="replace"))
+            alignment = align(doc1, doc2, mode=mode, backend=backend)
+        except Exception as exc:
+            records.append(dict(base, error=f"{type(exc).__name__}: {exc}"))
+            continue
+        for ((i, s1), (j, s2), sim) in alignment:
+            if sim >= threshold:
+                records.append(dict(base, sentence1=i, sentence2=j,
+                                    text1=s1, text2=s2, similarity=sim))
+    return records
+
+
+def directory_pairs(directory, pattern="*.txt"):
+    """Every unordered pair of matching files under `directory`."""
+    return itertools.combinations(sorted(Path(directory).rglob(pattern)), 2)
+
+
+def detect_plagiarism_batch(pairs, threshold=0.8, workers=None, chunk_size=8,
+                            backend="exact", mode="astar"):
+    """Align many (path1, path2) file pairs across a process pool.
+
+    `pairs` may also be a directory, in which case every pair of .txt files
+    in it is compared. Pairs are submitted in chunks of `chunk_size`, with
+    only a few chunks per worker in flight, and the above-threshold records
+    are yielded as each chunk finishes. A pair that cannot be aligned gives
+    a {"doc1", "doc2", "error"} record and the run carries on.
+    """
+    if isinstance(pairs, (str, Path)):
+        pairs = directory_pairs(pairs)
+    pairs = iter(pairs)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending = set()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(pairs, chunk_size))
+                if not chunk:
+                    break
+                pending.add(pool.submit(_align_files, chunk, threshold, backend, mode))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def write_jsonl(records, out=None):
+    """Write records as JSON lines, flushing each one; returns the count."""
+    out = out or sys.stdout
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        count += 1
+    return count
+
+
 # -----------------------
 # Example Usage
 # -----------------------
 
-if __name__ == "__main__":
+if __name__ == "__main__" and len(sys.argv) > 1:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Align every pair of .txt files in a directory.")
+    parser.add_argument("directory")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--backend", default="exact", choices=["exact", "cosine", "jaccard"])
+    parser.add_argument("--mode", default="astar", choices=["astar", "banded", "hirschberg"])
+    parser.add_argument("--output", help="JSON-lines file (default: stdout)")
+    args = parser.parse_args()
+
+    records = detect_plagiarism_batch(args.directory, threshold=args.threshold,
+                                      workers=args.workers, chunk_size=args.chunk_size,
+                                      backend=args.backend, mode=args.mode)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_jsonl(records, out)
+    else:
+        write_jsonl(records)
+
+elif __name__ == "__main__":
     text1 = """Artificial Intelligence is transforming the world.
     It has applications in every field.
     Machine learning is a core part of AI.
@@ -109,4 +732,4 @@ if __name__ == "__main__":
     Detecting plagiarism ensures honesty in academics.
     Robotics is another application of AI."""
 
-    detect_plagiarism(text1, text2)
\ No newline at end of file
+    detect_plagiarism(text1, text2)
@@ -0,0 +1,194 @@
+import hashlib
+import re
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+
+from Astar_plagarism import a_star_align, sentence_tokenize
+
+# -----------------------
+# Shingling
+# -----------------------
+
+def word_shingles(sentence, k=3):
+    """Hashed k-word shingles of a sentence (the whole sentence if shorter)."""
+    words = re.findall(r"\w+", sentence.lower())
+    if not words:
+        return set()
+    if len(words) < k:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[p:p + k]) for p in range(len(words) - k + 1)]
+    # Python's hash() is salted per process, so use a stable 63-bit digest
+    return {int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big") >> 1
+            for g in grams}
+
+
+# -----------------------
+# On-disk inverted index
+# -----------------------
+
+class CorpusIndex:
+    """Inverted index from word shingles to (document, sentence) postings.
+
+    Stored in SQLite so it persists between runs and a query only touches
+    the postings of its own shingles, not the whole corpus.
+    """
+
+    def __init__(self, path, shingle_size=3):
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+            CREATE TABLE IF NOT EXISTS sentences (doc INTEGER, idx INTEGER, text TEXT,
+                                                  PRIMARY KEY (doc, idx));
+            CREATE TABLE IF NOT EXISTS postings (shingle INTEGER, doc INTEGER, idx INTEGER);
+            CREATE INDEX IF NOT EXISTS postings_shingle ON postings (shingle);
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+        """)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'shingle_size'").fetchone()
+        if row is None:
+            self.db.execute("INSERT INTO meta VALUES ('shingle_size', ?)", (str(shingle_size),))
+            self.db.commit()
+            self.shingle_size = shingle_size
+        else:
+            # an existing index keeps the shingle size it was built with
+            self.shingle_size = int(row[0])
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add_document(self, name, text, commit=True):
+        """Tokenize and index one document; re-adding a name replaces it."""
+        old = self.db.execute("SELECT id FROM documents WHERE name = ?", (name,)).fetchone()
+        if old is not None:
+            for table in ("documents", "sentences", "postings"):
+                column = "id" if table == "documents" else "doc"
+                self.db.execute(f"DELETE FROM {table} WHERE {column} = ?", old)
+
+        doc_id = self.db.execute("INSERT INTO documents (name) VALUES (?)", (name,)).lastrowid
+        sentences = sentence_tokenize(text)
+        self.db.executemany("INSERT INTO sentences VALUES (?, ?, ?)",
+                            [(doc_id, idx, s) for idx, s in enumerate(sentences)])
+        self.db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                            [(sh, doc_id, idx)
+                             for idx, s in enumerate(sentences)
+                             for sh in word_shingles(s, self.shingle_size)])
+        if commit:
+            self.db.commit()
+        return doc_id
+
+    def add_directory(self, directory, pattern="*.txt", encoding="utf-8"):
+        """Index every matching file under `directory`, named by relative path."""
+        directory = Path(directory)
+        count = 0
+        for path in sorted(directory.rglob(pattern)):
+            text = path.read_text(encoding=encoding, errors="replace")
+            self.add_document(str(path.relative_to(directory)), text, commit=False)
+            count += 1
+        self.db.commit()
+        return count
+
+    def candidates(self, sentences, min_shared=2, max_postings=None):
+        """Map doc id -> sorted candidate (query idx, doc sentence idx) pairs.
+
+        A pair is a candidate when the two sentences share at least
+        `min_shared` shingles (or all of the query sentence's, if it has
+        fewer). Shingles with more than `max_postings` postings are treated
+        as boilerplate and skipped.
+        """
+        hits = defaultdict(int)
+        needed = {}
+        for qi, sentence in enumerate(sentences):
+            shingles = word_shingles(sentence, self.shingle_size)
+            needed[qi] = min(min_shared, len(shingles))
+            for sh in shingles:
+                postings = self.db.execute(
+                    "SELECT doc, idx FROM postings WHERE shingle = ?", (sh,)).fetchall()
+                if max_postings is not None and len(postings) > max_postings:
+                    continue
+                for doc, idx in postings:
+                    hits[(doc, qi, idx)] += 1
+
+        result = defaultdict(list)
+        for (doc, qi, idx), shared in hits.items():
+            if needed[qi] and shared >= needed[qi]:
+                result[doc].append((qi, idx))
+        for pairs in result.values():
+            pairs.sort()
+        return dict(result)
+
+    def document_name(self, doc_id):
+        return self.db.execute("SELECT name FROM documents WHERE id = ?", (doc_id,)).fetchone()[0]
+
+    def sentences(self, doc_id, indices):
+        placeholders = ",".join("?" * len(indices))
+        rows = self.db.execute(
+            f"SELECT idx, text FROM sentences WHERE doc = ? AND idx IN ({placeholders})",
+            (doc_id, *indices)).fetchall()
+        return dict(rows)
+
+    def screen(self, text, threshold=0.8, min_shared=2, max_postings=None, backend="exact"):
+        """Align a query document against the indexed documents that share shingles with it.
+
+        Only the candidate sentences of each candidate document go through
+        a_star_align(); returns a list of
+        {"document", "query_sentence", "doc_sentence", "query", "match", "similarity"}.
+        """
+        query = sentence_tokenize(text)
+        findings = []
+        for doc_id, pairs in sorted(self.candidates(query, min_shared, max_postings).items()):
+            q_idx = sorted({qi for qi, _ in pairs})
+            d_idx = sorted({di for _, di in pairs})
+            d_text = self.sentences(doc_id, d_idx)
+            name = self.document_name(doc_id)
+
+            alignment = a_star_align([query[qi] for qi in q_idx],
+                                     [d_text[di] for di in d_idx], backend=backend)
+            for ((a, s1), (b, s2), sim) in alignment:
+                if sim >= threshold:
+                    findings.append({
+                        "document": name,
+                        "query_sentence": q_idx[a],
+                        "doc_sentence": d_idx[b],
+                        "query": s1,
+                        "match": s2,
+                        "similarity": sim,
+                    })
+        return findings
+
+
+# -----------------------
+# Example Usage
+# -----------------------
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Screen a submission against an indexed corpus.")
+    parser.add_argument("index", help="SQLite index file (created if missing)")
+    parser.add_argument("--add", metavar="DIR", help="index every .txt file under DIR first")
+    parser.add_argument("--query", metavar="FILE", help="submission to screen")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    with CorpusIndex(args.index) as index:
+        if args.add:
+            print(f"Indexed {index.add_directory(args.add)} documents ({len(index)} total)")
+        if args.query:
+            text = Path(args.query).read_text(encoding="utf-8", errors="replace")
+            print("\n--- Potentially Plagiarized Sentences ---\n")
+            for f in index.screen(text, threshold=args.threshold):
+                print(f"[Query: Sentence {f['query_sentence']+1}] {f['query']}")
+                print(f"[{f['document']}: Sentence {f['doc_sentence']+1}] {f['match']}")
+                print(f"→ Similarity: {f['similarity']:.2f}")
+                print("-" * 60)
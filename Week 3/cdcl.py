@@ -0,0 +1,377 @@
+import heapq
+import random
+
+# -----------------------------------------------------------------------------
+# Conflict-driven clause learning (CDCL) SAT solver
+# -----------------------------------------------------------------------------
+# Complete counterpart to the local searches: it either finds a satisfying
+# assignment or proves that none exists. Literals are signed 1-based ints
+# internally (DIMACS style); clause lists in the notebook's (var, sign)
+# format are converted on the way in.
+
+SAT, UNSAT, UNKNOWN = "SAT", "UNSAT", "UNKNOWN"
+
+
+def to_signed(clauses):
+    """Clauses as lists of signed 1-based ints, converting (var, sign) pairs."""
+    result = []
+    for clause in clauses:
+        clause = list(clause)
+        if clause and not isinstance(clause[0], int):
+            clause = [(v + 1) if sign else -(v + 1) for v, sign in clause]
+        result.append(clause)
+    return result
+
+
+def luby(y, x):
+    """x-th element (0-based) of the Luby restart sequence scaled by powers of y."""
+    size, seq = 1, 0
+    while size < x + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != x:
+        size = (size - 1) >> 1
+        seq -= 1
+        x = x % size
+    return y ** seq
+
+
+class CDCLSolver:
+    """Two-watched-literal propagation, 1-UIP learning, VSIDS branching with
+    phase saving, Luby restarts and LBD-based learned-clause deletion."""
+
+    def __init__(self, clauses, n, var_decay=0.95, restart_base=100,
+                 learnt_factor=1 / 3, seed=None):
+        self.n = n
+        self.value = [0] * (n + 1)      # 1 true, -1 false, 0 unassigned
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)  # index of the clause that implied the variable
+        self.phase = [-1] * (n + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+
+        self.clauses = []
+        self.learnt = []
+        self.deleted = []
+        self.lbd = []
+        self.watches = [[] for _ in range(2 * n + 1)]  # indexed by lit + n
+
+        rng = random.Random(seed)
+        # tiny random activities break the initial ties between variables
+        self.activity = [0.0] + [rng.random() * 1e-5 for _ in range(n)]
+        self.var_inc = 1.0
+        self.var_decay = var_decay
+        self.heap = [(-self.activity[v], v) for v in range(1, n + 1)]
+        heapq.heapify(self.heap)
+
+        self.restart_base = restart_base
+        self.seen = [False] * (n + 1)
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+        self.ok = True
+        for clause in to_signed(clauses):
+            if not self._add_input_clause(clause):
+                self.ok = False
+                break
+        self.max_learnts = max(1000, len(self.clauses) * learnt_factor)
+
+    # ---- assignment helpers ----
+
+    def lit_value(self, lit):
+        val = self.value[abs(lit)]
+        return val if lit > 0 else -val
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    def _enqueue(self, lit, reason):
+        v = abs(lit)
+        self.value[v] = 1 if lit > 0 else -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _attach(self, clause, learnt, lbd=0):
+        ci = len(self.clauses)
+        self.clauses.append(clause)
+        self.learnt.append(learnt)
+        self.deleted.append(False)
+        self.lbd.append(lbd)
+        self.watches[clause[0] + self.n].append(ci)
+        self.watches[clause[1] + self.n].append(ci)
+        return ci
+
+    def _add_input_clause(self, clause):
+        lits = []
+        for lit in clause:
+            if -lit in lits:
+                return True  # tautology
+            if lit not in lits:
+                lits.append(lit)
+        if not lits:
+            return False
+        if len(lits) == 1:
+            val = self.lit_value(lits[0])
+            if val == -1:
+                return False
+            if val == 0:
+                self._enqueue(lits[0], None)
+            return True
+        self._attach(lits, learnt=False)
+        return True
+
+    # ---- propagation ----
+
+    def propagate(self):
+        """Unit propagation over the trail; returns a conflicting clause index or None."""
+        n = self.n
+        trail, clauses, deleted = self.trail, self.clauses, self.deleted
+        value = self.value
+        while self.qhead < len(trail):
+            p = trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            false_lit = -p
+            ws = self.watches[false_lit + n]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                ci = ws[i]
+                i += 1
+                if deleted[ci]:
+                    continue  # drop stale watch
+                c = clauses[ci]
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                first = c[0]
+                fv = value[abs(first)]
+                if (fv if first > 0 else -fv) == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                # look for a new literal to watch
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    lv = value[abs(lit)]
+                    if (lv if lit > 0 else -lv) != -1:
+                        c[1], c[k] = lit, c[1]
+                        self.watches[lit + n].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if (fv if first > 0 else -fv) == -1:
+                        # conflict: keep the rest of the watch list
+                        while i < end:
+                            ws[j] = ws[i]
+                            i += 1
+                            j += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return ci
+                    self._enqueue(first, ci)
+            del ws[j:]
+        return None
+
+    # ---- conflict analysis ----
+
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(1, self.n + 1) if self.value[u] == 0]
+            heapq.heapify(self.heap)
+        elif self.value[v] == 0:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def analyze(self, conflict):
+        """1-UIP learning; returns (learnt clause, backjump level, LBD)."""
+        seen, level, trail = self.seen, self.level, self.trail
+        current = self.decision_level()
+        learnt = [0]  # slot for the asserting literal
+        touched = []
+        counter = 0
+        p = 0
+        ci = conflict
+        idx = len(trail) - 1
+
+        while True:
+            for q in self.clauses[ci]:
+                v = abs(q)
+                if v == abs(p) or seen[v] or level[v] == 0:
+                    continue
+                seen[v] = True
+                touched.append(v)
+                self._bump(v)
+                if level[v] == current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+            # next literal of the current level on the trail
+            while not seen[abs(trail[idx])]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            ci = self.reason[abs(p)]
+        learnt[0] = -p
+
+        for v in touched:
+            seen[v] = False
+
+        if len(learnt) == 1:
+            back_level = 0
+        else:
+            # put the highest-level remaining literal second so it gets watched
+            best = max(range(1, len(learnt)), key=lambda k: level[abs(learnt[k])])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            back_level = level[abs(learnt[1])]
+        lbd = len({level[abs(q)] for q in learnt})
+        return learnt, back_level, lbd
+
+    def backtrack(self, target):
+        if self.decision_level() <= target:
+            return
+        start = self.trail_lim[target]
+        for lit in reversed(self.trail[start:]):
+            v = abs(lit)
+            self.phase[v] = self.value[v]
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = len(self.trail)
+
+    # ---- branching and clause database ----
+
+    def pick_branch(self):
+        heap, value = self.heap, self.value
+        while heap:
+            _, v = heapq.heappop(heap)
+            if value[v] == 0:
+                return v if self.phase[v] == 1 else -v
+        return None
+
+    def _locked(self, ci):
+        c = self.clauses[ci]
+        return self.reason[abs(c[0])] == ci and self.lit_value(c[0]) == 1
+
+    def reduce_db(self):
+        """Delete the worse half of the learned clauses (highest LBD first).
+
+        Binary clauses, glue clauses (LBD <= 2) and current reasons are kept.
+        """
+        candidates = [ci for ci in range(len(self.clauses))
+                      if self.learnt[ci] and not self.deleted[ci]
+                      and len(self.clauses[ci]) > 2 and self.lbd[ci] > 2
+                      and not self._locked(ci)]
+        candidates.sort(key=lambda ci: (self.lbd[ci], len(self.clauses[ci])), reverse=True)
+        for ci in candidates[:len(candidates) // 2]:
+            self.deleted[ci] = True
+            self.clauses[ci] = []
+
+    def num_learnts(self):
+        return sum(1 for ci in range(len(self.clauses)) if self.learnt[ci] and not self.deleted[ci])
+
+    # ---- main loop ----
+
+    def solve(self, max_conflicts=None):
+        if not self.ok:
+            return UNSAT
+        restarts = 0
+        restart_limit = self.restart_base * luby(2, restarts)
+        since_restart = 0
+        live_learnts = 0
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if self.decision_level() == 0:
+                    return UNSAT
+                learnt, back_level, lbd = self.analyze(conflict)
+                self.backtrack(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    ci = self._attach(learnt, learnt=True, lbd=lbd)
+                    live_learnts += 1
+                    self._enqueue(learnt[0], ci)
+                self.var_inc /= self.var_decay
+                if max_conflicts is not None and self.conflicts >= max_conflicts:
+                    return UNKNOWN
+                continue
+
+            if since_restart >= restart_limit:
+                restarts += 1
+                restart_limit = self.restart_base * luby(2, restarts)
+                since_restart = 0
+                self.backtrack(0)
+                continue
+
+            if live_learnts - len(self.trail) >= self.max_learnts:
+                self.reduce_db()
+                live_learnts = self.num_learnts()
+                self.max_learnts *= 1.1
+
+            lit = self.pick_branch()
+            if lit is None:
+                return SAT
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+    def model(self):
+        """Satisfying assignment as a tuple of bools, variable 1 at index 0."""
+        return tuple(self.value[v] == 1 for v in range(1, self.n + 1))
+
+
+def cdcl(clauses, n, max_conflicts=None, seed=None):
+    """Solve a clause list; returns a result dict with 'status' SAT, UNSAT or UNKNOWN.
+
+    For SAT the dict carries the assignment (0-based, like the local
+    searches) and 'solved' is True; UNSAT means no assignment exists.
+    """
+    solver = CDCLSolver(clauses, n, seed=seed)
+    status = solver.solve(max_conflicts=max_conflicts)
+    return {
+        'status': status,
+        'solved': status == SAT,
+        'assignment': solver.model() if status == SAT else None,
+        'conflicts': solver.conflicts,
+        'decisions': solver.decisions,
+        'propagations': solver.propagations,
+    }
+
+
+def check_model(clauses, assignment):
+    """True if the 0-based assignment satisfies every clause."""
+    return all(any(assignment[abs(lit) - 1] == (lit > 0) for lit in clause)
+               for clause in to_signed(clauses))
+
+
+if __name__ == "__main__":
+    import time
+
+    from ksat import generate_k_sat
+
+    random.seed(1)
+    for n in (50, 100, 150):
+        for ratio in (3.5, 4.26, 5.0):
+            clauses = generate_k_sat(3, int(ratio * n), n)
+            t0 = time.time()
+            out = cdcl(clauses, n)
+            t1 = time.time()
+            if out['solved']:
+                assert check_model(clauses, out['assignment'])
+            print(f"n={n:<4} m/n={ratio:<5} {out['status']:<6} conflicts={out['conflicts']:<7} "
+                  f"time={t1 - t0:.3f}s")
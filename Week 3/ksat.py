@@ -1,31 +1,46 @@
+import argparse
+import os
 import random
+from array import array
 
-def generate_k_sat(k, m, n):
+
+def iter_k_sat(k, m, n, rng=None):
     """
-    Generates a random k-SAT problem.
-    Each clause contains k distinct variables or their negations.
+    Yields the clauses of a random k-SAT problem one at a time, so that
+    large instances never have to be held in memory.
 
     Parameters:
         k (int): Number of literals per clause
         m (int): Number of clauses
         n (int): Number of variables
-
-    Returns:
-        list: List of clauses (each clause is a list of integers)
+        rng (random.Random): Source of randomness (defaults to the random module)
     """
     if k > n:
         raise ValueError("k cannot be greater than n since variables must be distinct in a clause.")
+    rng = rng or random
 
-    clauses = []
     for _ in range(m):
         # Randomly choose k distinct variables from n
-        variables = random.sample(range(1, n + 1), k)
+        variables = rng.sample(range(1, n + 1), k)
 
         # Randomly negate each variable with 50% chance
-        clause = [var if random.choice([True, False]) else -var for var in variables]
-        clauses.append(clause)
+        yield [var if rng.choice([True, False]) else -var for var in variables]
+
 
-    return clauses
+def generate_k_sat(k, m, n):
+    """
+    Generates a random k-SAT problem.
+    Each clause contains k distinct variables or their negations.
+
+    Parameters:
+        k (int): Number of literals per clause
+        m (int): Number of clauses
+        n (int): Number of variables
+
+    Returns:
+        list: List of clauses (each clause is a list of integers)
+    """
+    return list(iter_k_sat(k, m, n))
 
 
 def print_k_sat(clauses):
@@ -40,14 +55,103 @@ def print_k_sat(clauses):
     print(" ∧ ".join(formula))
 
 
+# --- DIMACS CNF ---
+
+def write_dimacs(path, clauses, n, m, comments=()):
+    """
+    Writes clauses to a DIMACS CNF file as they are produced.
+    `clauses` may be any iterable (e.g. iter_k_sat()); `m` is needed up
+    front for the "p cnf" header and must match the number of clauses.
+    """
+    written = 0
+    with open(path, "w", buffering=1 << 20) as f:
+        for line in comments:
+            f.write(f"c {line}\n")
+        f.write(f"p cnf {n} {m}\n")
+        for clause in clauses:
+            f.write(" ".join(map(str, clause)))
+            f.write(" 0\n")
+            written += 1
+    if written != m:
+        raise ValueError(f"header announced {m} clauses but {written} were written")
+
+
+def generate_k_sat_file(path, k, m, n, seed=None):
+    """Streams a random k-SAT instance straight to a DIMACS file."""
+    rng = random.Random(seed)
+    write_dimacs(path, iter_k_sat(k, m, n, rng), n, m,
+                 comments=[f"random {k}-SAT, n={n}, m={m}, seed={seed}"])
+
+
+def read_dimacs(path):
+    """
+    Reads a DIMACS CNF file into a flat array('i') of literals in which
+    every clause is terminated by 0, the same layout as the file itself.
+
+    Returns:
+        tuple: (n, m, literals)
+    """
+    n = m = None
+    literals = array("i")
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "c":
+                continue
+            if line[0] == "p":
+                _, fmt, n, m = line.split()
+                if fmt != "cnf":
+                    raise ValueError(f"unsupported DIMACS format: {fmt}")
+                n, m = int(n), int(m)
+                continue
+            if line[0] == "%":  # SATLIB end marker
+                break
+            literals.extend(map(int, line.split()))
+    if n is None:
+        raise ValueError("missing 'p cnf' header")
+    if literals and literals[-1] != 0:
+        literals.append(0)
+    return n, m, literals
+
+
+def iter_clauses(literals):
+    """Yields clauses (lists of ints) from a 0-terminated flat literal buffer."""
+    clause = []
+    for lit in literals:
+        if lit == 0:
+            yield clause
+            clause = []
+        else:
+            clause.append(lit)
+
+
 # --- Main execution ---
 if __name__ == "__main__":
-    # Input values
-    k = int(input("Enter value of k (literals per clause): "))
-    m = int(input("Enter number of clauses (m): "))
-    n = int(input("Enter number of variables (n): "))
-
-    # Generate and print random k-SAT instance
-    clauses = generate_k_sat(k, m, n)
-    print("\nGenerated Random k-SAT Formula:\n")
-    print_k_sat(clauses)
+    parser = argparse.ArgumentParser(description="Generate random k-SAT instances.")
+    parser.add_argument("-k", type=int, nargs="+", default=[3], help="literals per clause")
+    parser.add_argument("-n", type=int, nargs="+", required=True, help="number of variables")
+    sizes = parser.add_mutually_exclusive_group(required=True)
+    sizes.add_argument("-m", type=int, nargs="+", help="number of clauses")
+    sizes.add_argument("--ratio", type=float, nargs="+", help="clause/variable ratio m/n")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[None])
+    parser.add_argument("--out", help="directory for .cnf files (prints the formula if omitted)")
+    args = parser.parse_args()
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    for k in args.k:
+        for n in args.n:
+            ms = args.m if args.m else [round(r * n) for r in args.ratio]
+            for m in ms:
+                for seed in args.seeds:
+                    if args.out:
+                        name = f"k{k}_n{n}_m{m}" + (f"_s{seed}" if seed is not None else "") + ".cnf"
+                        path = os.path.join(args.out, name)
+                        generate_k_sat_file(path, k, m, n, seed)
+                        print(path)
+                    else:
+                        # Generate and print random k-SAT instance
+                        clauses = list(iter_k_sat(k, m, n, random.Random(seed)))
+                        print(f"\nGenerated Random {k}-SAT Formula (n={n}, m={m}):\n")
+                        print_k_sat(clauses)
@@ -0,0 +1,225 @@
+import argparse
+import itertools
+import multiprocessing as mp
+import queue
+import random
+import signal
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from cdcl import cdcl
+from ksat import iter_k_sat
+from vectorized_sat import beam_search_np, hill_climbing_np
+from walksat import gsat, walksat
+
+# -----------------------------------------------------------------------------
+# Solver x heuristic grid
+# -----------------------------------------------------------------------------
+# Every entry is (algorithm, heuristic label, callable, keyword arguments).
+# Callables take (clauses, n, seed=..., **kwargs) and return the usual result
+# dict; 'iters' (flips) or 'conflicts' is used as the work counter.
+
+GRID = [
+    ("WalkSAT", "noise=0.5", walksat, {"noise": 0.5}),
+    ("WalkSAT", "noise=0.567", walksat, {"noise": 0.567}),
+    ("GSAT", "greedy", gsat, {}),
+    ("GSAT", "walk=0.3", gsat, {"walk_prob": 0.3}),
+    ("Hill Climb", "unsat", hill_climbing_np, {}),
+    ("Beam (w=4)", "unsat", beam_search_np, {"beam_width": 4}),
+    ("CDCL", "VSIDS", cdcl, {}),
+]
+
+
+class Timeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise Timeout()
+
+
+def make_instance(k, n, m, seed):
+    return list(iter_k_sat(k, m, n, random.Random(seed)))
+
+
+def run_one(algorithm, heuristic, k, n, m, seed, timeout=None, trace_memory=False):
+    """Generate one instance in the worker and run one grid entry on it.
+
+    The timeout uses SIGALRM, so it is only enforced on Unix.
+    """
+    solver, kwargs = next((f, kw) for a, h, f, kw in GRID if a == algorithm and h == heuristic)
+    clauses = make_instance(k, n, m, seed)
+
+    use_alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    if trace_memory:
+        tracemalloc.start()
+
+    t0 = time.perf_counter()
+    out, timed_out = None, False
+    try:
+        out = solver(clauses, n, seed=seed, **kwargs)
+    except Timeout:
+        timed_out = True
+    finally:
+        elapsed = time.perf_counter() - t0
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if timed_out:
+        status = "TIMEOUT"
+    elif "status" in out:
+        status = out["status"]
+    else:
+        status = "SAT" if out["solved"] else "UNKNOWN"
+    work = out.get("iters", out.get("conflicts")) if out else None
+    return {
+        "Algorithm": algorithm,
+        "Heuristic": heuristic,
+        "k": k, "n": n, "m": m, "ratio": round(m / n, 3), "seed": seed,
+        "Solved": bool(out and out.get("solved")),
+        "Status": status,
+        "Satisfied": out.get("sat_count") if out else None,
+        "Total": m,
+        "Work": work,
+        "Work/s": (work / elapsed) if work and elapsed > 0 else None,
+        "Time (s)": elapsed,
+        "Peak memory (B)": peak,
+    }
+
+
+def run_grid(ns, ratios, seeds, k=3, grid=None, workers=None, timeout=None, trace_memory=False):
+    """Run every grid entry on every (n, m/n, seed) instance across a process pool.
+
+    Yields result rows as they complete.
+    """
+    grid = grid or [(a, h) for a, h, _, _ in GRID]
+    jobs = [(a, h, k, n, max(1, round(r * n)), s)
+            for n, r, s in itertools.product(ns, ratios, seeds)
+            for a, h in grid]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_one, *job, timeout=timeout, trace_memory=trace_memory)
+                   for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(df):
+    """Solve rate, throughput and time-to-solution percentiles per configuration."""
+    keys = ["Algorithm", "Heuristic", "n", "ratio"]
+    solved = df[df["Solved"]]
+    summary = df.groupby(keys).agg(
+        runs=("Solved", "size"),
+        solve_rate=("Solved", "mean"),
+        work_per_s=("Work/s", "median"),
+        peak_memory=("Peak memory (B)", "max"),
+    )
+    if solved.empty:
+        summary["tts_p50"] = summary["tts_p90"] = float("nan")
+        return summary.reset_index()
+    tts = solved.groupby(keys)["Time (s)"].quantile([0.5, 0.9]).unstack()
+    tts.columns = ["tts_p50", "tts_p90"]
+    return summary.join(tts).reset_index()
+
+
+def save_table(df, path):
+    if str(path).endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+# -----------------------------------------------------------------------------
+# Portfolio: race several solvers on one instance
+# -----------------------------------------------------------------------------
+
+def _portfolio_worker(index, clauses, n, seed, results):
+    algorithm, heuristic, solver, kwargs = GRID[index]
+    try:
+        out = solver(clauses, n, seed=seed, **kwargs)
+    except Exception:
+        out = None  # report back so the race does not wait for this entry
+    results.put((algorithm, heuristic, out))
+
+
+def portfolio(clauses, n, entries=None, timeout=None, seed=None):
+    """Run several grid entries in parallel and return the first conclusive answer.
+
+    A result counts when it is solved or is a proof of UNSAT; the other
+    processes are then terminated. Returns (algorithm, heuristic, result)
+    or None if nobody finished within `timeout` seconds.
+    """
+    if entries is None:
+        entries = [("WalkSAT", "noise=0.567"), ("GSAT", "walk=0.3"), ("CDCL", "VSIDS")]
+    indices = [next(i for i, (a, h, _, _) in enumerate(GRID) if (a, h) == e) for e in entries]
+
+    results = mp.Queue()
+    procs = [mp.Process(target=_portfolio_worker, args=(i, clauses, n, seed, results), daemon=True)
+             for i in indices]
+    for p in procs:
+        p.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    winner = None
+    pending = len(procs)
+    try:
+        while pending and winner is None:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                algorithm, heuristic, out = results.get(timeout=wait)
+            except queue.Empty:
+                break
+            pending -= 1
+            if out and (out.get("solved") or out.get("status") == "UNSAT"):
+                winner = (algorithm, heuristic, out)
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+    return winner
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SAT solvers over random k-SAT families.")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("-n", type=int, nargs="+", default=[50, 100])
+    parser.add_argument("--ratio", type=float, nargs="+", default=[3.0, 4.26])
+    parser.add_argument("--seeds", type=int, default=5, help="instances per (n, ratio)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per run")
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--out", default="sat_results.csv", help=".csv or .parquet")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="race the portfolio on one instance per (n, ratio) instead")
+    args = parser.parse_args()
+
+    if args.portfolio:
+        for n, r in itertools.product(args.n, args.ratio):
+            clauses = make_instance(args.k, n, max(1, round(r * n)), 0)
+            t0 = time.time()
+            win = portfolio(clauses, n, timeout=args.timeout, seed=0)
+            label = f"{win[0]} ({win[1]})" if win else "none"
+            print(f"n={n} m/n={r}: winner={label} in {time.time() - t0:.3f}s")
+    else:
+        rows = []
+        for row in run_grid(args.n, args.ratio, range(args.seeds), k=args.k,
+                            workers=args.workers, timeout=args.timeout,
+                            trace_memory=args.trace_memory):
+            rows.append(row)
+            print(f"{row['Algorithm']:<11} {row['Heuristic']:<12} n={row['n']:<5} "
+                  f"m/n={row['ratio']:<6} seed={row['seed']:<3} {row['Status']:<8} "
+                  f"{row['Time (s)']:.3f}s")
+        df = pd.DataFrame(rows)
+        save_table(df, args.out)
+        summary = summarize(df)
+        print(summary.to_string(index=False))
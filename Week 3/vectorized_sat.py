@@ -0,0 +1,180 @@
+import random
+
+import numpy as np
+
+from walksat import normalize_clauses
+
+# -----------------------------------------------------------------------------
+# Compact instance: literal matrix + sign mask
+# -----------------------------------------------------------------------------
+
+def to_arrays(clauses):
+    """(m, k) int32 variable matrix and (m, k) bool sign mask for a clause list.
+
+    Shorter clauses are padded by repeating their first literal, which does
+    not change the clause's truth value.
+    """
+    clauses = normalize_clauses(clauses)
+    k = max((len(c) for c in clauses), default=0)
+    lits = np.empty((len(clauses), k), dtype=np.int32)
+    signs = np.empty((len(clauses), k), dtype=bool)
+    for i, clause in enumerate(clauses):
+        padded = list(clause) + [clause[0]] * (k - len(clause))
+        lits[i] = [v for v, _ in padded]
+        signs[i] = [s for _, s in padded]
+    return lits, signs
+
+
+def _clause_masks(lits, signs):
+    """Masks for flip1_scores over a to_arrays() instance.
+
+    first is False where a literal repeats an earlier one of its row (the
+    padding, or a duplicate literal); tautology marks clauses holding some
+    variable with both signs, which no single flip can falsify.
+    """
+    first = np.ones(lits.shape, dtype=bool)
+    tautology = np.zeros(len(lits), dtype=bool)
+    for j in range(1, lits.shape[1]):
+        same_var = lits[:, j:j + 1] == lits[:, :j]
+        same_sign = signs[:, j:j + 1] == signs[:, :j]
+        first[:, j] = ~(same_var & same_sign).any(axis=1)
+        tautology |= (same_var & ~same_sign).any(axis=1)
+    return first, tautology
+
+
+def pack(assignment):
+    """Assignment (tuple of bools, or a population of them) as a bool array."""
+    return np.asarray(assignment, dtype=bool)
+
+
+# -----------------------------------------------------------------------------
+# Batched evaluation
+# -----------------------------------------------------------------------------
+
+def num_satisfied_batch(lits, signs, population, chunk=256):
+    """Satisfied-clause counts for every row of a (P, n) population.
+
+    Evaluated `chunk` assignments at a time so the (chunk, m, k) literal
+    tensor stays bounded.
+    """
+    population = np.atleast_2d(pack(population))
+    out = np.empty(len(population), dtype=np.int64)
+    for start in range(0, len(population), chunk):
+        block = population[start:start + chunk]
+        lit_true = block[:, lits] == signs  # (P, m, k)
+        out[start:start + chunk] = lit_true.any(axis=2).sum(axis=1)
+    return out
+
+
+def flip1_scores(lits, signs, assignment, masks=None):
+    """Satisfied-clause count after flipping each variable, for all n at once.
+
+    Uses make/break counts: flipping v satisfies every unsatisfied clause
+    containing v and breaks every clause in which v is the only true literal.
+    Returns (sat_now, sat_after) where sat_after has shape (n,). `masks` is
+    _clause_masks(lits, signs), computed here when not given.
+    """
+    a = pack(assignment)
+    n = len(a)
+    first, tautology = _clause_masks(lits, signs) if masks is None else masks
+    lit_true = (a[lits] == signs) & first
+    true_count = lit_true.sum(axis=1)
+    sat_now = int((true_count > 0).sum())
+
+    # an unsatisfied clause is never a tautology, so its variables are distinct
+    unsat = true_count == 0
+    make = np.bincount(lits[unsat][first[unsat]], minlength=n)
+
+    crit = (true_count == 1) & ~tautology
+    crit_vars = lits[crit, lit_true[crit].argmax(axis=1)]
+    brk = np.bincount(crit_vars, minlength=n)
+
+    return sat_now, sat_now + make - brk
+
+
+# -----------------------------------------------------------------------------
+# Bulk-neighborhood versions of the notebook's local searches
+# -----------------------------------------------------------------------------
+
+def hill_climbing_np(clauses, n, max_iters=200, restarts=3, seed=None):
+    """hill_climbing() with the 'unsat' heuristic, scoring all flip-1 neighbors per step."""
+    rng = np.random.default_rng(seed)
+    lits, signs = to_arrays(clauses)
+    masks = _clause_masks(lits, signs)
+    m = len(lits)
+
+    best_result = None
+    for r in range(restarts):
+        a = rng.random(n) < 0.5
+        sat, after = flip1_scores(lits, signs, a, masks)
+        it = 0
+        while it < max_iters and sat < m:
+            it += 1
+            v = int(after.argmax())
+            if after[v] <= sat:
+                break
+            a[v] = not a[v]
+            sat, after = flip1_scores(lits, signs, a, masks)
+        solved = (sat == m)
+        if best_result is None or sat > best_result['sat_count']:
+            best_result = {'assignment': tuple(bool(x) for x in a), 'sat_count': sat,
+                           'solved': solved, 'iters': it, 'restarts': r + 1}
+        if solved:
+            break
+    return best_result
+
+
+def beam_search_np(clauses, n, beam_width=3, max_iters=100, seed=None):
+    """beam_search() with the 'unsat' heuristic, scoring each beam member's neighborhood in bulk."""
+    rng = np.random.default_rng(seed)
+    lits, signs = to_arrays(clauses)
+    masks = _clause_masks(lits, signs)
+    m = len(lits)
+
+    beam = [rng.random(n) < 0.5 for _ in range(beam_width)]
+    seen = {a.tobytes() for a in beam}
+    best = None
+    for it in range(max_iters):
+        scored = []
+        for b, a in enumerate(beam):
+            sat, after = flip1_scores(lits, signs, a, masks)
+            if sat == m:
+                return {'assignment': tuple(bool(x) for x in a), 'sat_count': sat,
+                        'solved': True, 'iters': it}
+            scored.append(after)
+        # (beam member, variable) pairs ordered by neighbor score, best first
+        scores = np.stack(scored)
+        order = np.argsort(-scores, axis=None, kind='stable')
+
+        new_beam = []
+        for flat in order:
+            b, v = divmod(int(flat), n)
+            nb = beam[b].copy()
+            nb[v] = not nb[v]
+            key = nb.tobytes()
+            if key in seen:
+                continue
+            seen.add(key)
+            new_beam.append(nb)
+            if len(new_beam) == beam_width:
+                break
+        if not new_beam:
+            break
+        beam = new_beam
+        top = int(num_satisfied_batch(lits, signs, beam[:1])[0])
+        if best is None or top > best['sat_count']:
+            best = {'assignment': tuple(bool(x) for x in beam[0]), 'sat_count': top,
+                    'solved': top == m}
+    return best
+
+
+if __name__ == "__main__":
+    n, m = 200, 800
+    rnd = random.Random(1)
+    clauses = [tuple((v, rnd.random() < 0.5) for v in rnd.sample(range(n), 3)) for _ in range(m)]
+    lits, signs = to_arrays(clauses)
+
+    population = np.random.default_rng(0).random((1000, n)) < 0.5
+    print("best of 1000 random assignments:", num_satisfied_batch(lits, signs, population).max(), "/", m)
+    print("hill climbing:", hill_climbing_np(clauses, n, seed=0)['sat_count'], "/", m)
+    print("beam search:", beam_search_np(clauses, n, beam_width=4, seed=0)['sat_count'], "/", m)
@@ -0,0 +1,259 @@
+import random
+
+# -----------------------------------------------------------------------------
+# Clause format
+# -----------------------------------------------------------------------------
+# Clauses are tuples of (var, sign) pairs with 0-based variables, as produced
+# by gen_uniform_random_3sat() in 3sat.ipynb. Signed-integer clauses from
+# ksat.generate_k_sat() (1-based, negative = negated) go through
+# normalize_clauses() first.
+
+def normalize_clauses(clauses):
+    """Return clauses as tuples of (var, sign), converting signed-int clauses."""
+    result = []
+    for clause in clauses:
+        if clause and isinstance(clause[0], int):
+            result.append(tuple((abs(lit) - 1, lit > 0) for lit in clause))
+        else:
+            result.append(tuple((v, bool(sign)) for v, sign in clause))
+    return result
+
+
+def instance_struct(clauses, n):
+    occ = {i: [] for i in range(n)}
+    for i, c in enumerate(clauses):
+        for v, sign in c:
+            occ[v].append((i, sign))
+    return occ
+
+
+class IncrementalState:
+    """Assignment plus per-clause counters kept up to date on every flip.
+
+    true_count[c]  number of true literals in clause c
+    true_sum[c]    sum of the variables whose literal is true; equals the
+                   single critical variable whenever true_count[c] == 1
+    unsat          list of unsatisfied clauses (with unsat_pos for O(1) removal)
+    make[v]        unsatisfied clauses that flipping v would satisfy
+    brk[v]         satisfied clauses that flipping v would break
+
+    A flip of v only touches the clauses in occ[v], so it costs
+    O(occurrences of v * k) instead of re-evaluating the whole formula.
+    """
+
+    def __init__(self, clauses, n, occ, assignment):
+        self.clauses = clauses
+        self.n = n
+        self.occ = occ
+        self.assignment = list(assignment)
+
+        m = len(clauses)
+        self.true_count = [0] * m
+        self.true_sum = [0] * m
+        self.make = [0] * n
+        self.brk = [0] * n
+        self.unsat = []
+        self.unsat_pos = [-1] * m
+
+        a = self.assignment
+        for c, clause in enumerate(clauses):
+            for v, sign in clause:
+                if a[v] == sign:
+                    self.true_count[c] += 1
+                    self.true_sum[c] += v
+            if self.true_count[c] == 0:
+                self._add_unsat(c)
+                for v, _ in clause:
+                    self.make[v] += 1
+            elif self.true_count[c] == 1:
+                self.brk[self.true_sum[c]] += 1
+
+    def _add_unsat(self, c):
+        self.unsat_pos[c] = len(self.unsat)
+        self.unsat.append(c)
+
+    def _remove_unsat(self, c):
+        pos = self.unsat_pos[c]
+        last = self.unsat.pop()
+        if last != c:
+            self.unsat[pos] = last
+            self.unsat_pos[last] = pos
+        self.unsat_pos[c] = -1
+
+    def score(self, v):
+        """Net change in satisfied clauses if v is flipped."""
+        return self.make[v] - self.brk[v]
+
+    def flip(self, v):
+        a = self.assignment
+        a[v] = not a[v]
+        value = a[v]
+        for c, sign in self.occ[v]:
+            if sign == value:
+                # literal became true
+                tc = self.true_count[c]
+                if tc == 0:
+                    self._remove_unsat(c)
+                    for u, _ in self.clauses[c]:
+                        self.make[u] -= 1
+                    self.brk[v] += 1
+                elif tc == 1:
+                    self.brk[self.true_sum[c]] -= 1
+                self.true_count[c] = tc + 1
+                self.true_sum[c] += v
+            else:
+                # literal became false
+                tc = self.true_count[c] - 1
+                self.true_count[c] = tc
+                self.true_sum[c] -= v
+                if tc == 0:
+                    self._add_unsat(c)
+                    for u, _ in self.clauses[c]:
+                        self.make[u] += 1
+                    self.brk[v] -= 1
+                elif tc == 1:
+                    self.brk[self.true_sum[c]] += 1
+
+    def result(self, flips, restarts):
+        sat_count = len(self.clauses) - len(self.unsat)
+        return {'assignment': tuple(self.assignment), 'sat_count': sat_count,
+                'solved': not self.unsat, 'iters': flips, 'restarts': restarts}
+
+
+class ScoredState(IncrementalState):
+    """IncrementalState with every variable kept in a bucket by its score.
+
+    Scores make - brk lie in [-deg, deg] for the largest occurrence count
+    deg, so buckets is a list indexed by score + deg. A flip re-buckets
+    only the variables sharing a clause with the flipped one, and the best
+    bucket is found from a high-water mark, so picking the argmax over all
+    n variables costs O(occurrences) per flip instead of O(n).
+    """
+
+    def __init__(self, clauses, n, occ, assignment):
+        super().__init__(clauses, n, occ, assignment)
+        self.offset = max((len(o) for o in occ.values()), default=0)
+        self.buckets = [[] for _ in range(2 * self.offset + 1)]
+        self.bucket_pos = [0] * n
+        self.var_score = [0] * n
+        self.top = 0
+        for v in range(n):
+            self._insert(v, self.score(v))
+
+    def _insert(self, v, s):
+        idx = s + self.offset
+        bucket = self.buckets[idx]
+        self.bucket_pos[v] = len(bucket)
+        bucket.append(v)
+        self.var_score[v] = s
+        if idx > self.top:
+            self.top = idx
+
+    def _remove(self, v):
+        bucket = self.buckets[self.var_score[v] + self.offset]
+        pos = self.bucket_pos[v]
+        last = bucket.pop()
+        if last != v:
+            bucket[pos] = last
+            self.bucket_pos[last] = pos
+
+    def flip(self, v):
+        super().flip(v)
+        for c, _ in self.occ[v]:
+            for u, _ in self.clauses[c]:
+                s = self.make[u] - self.brk[u]
+                if s != self.var_score[u]:
+                    self._remove(u)
+                    self._insert(u, s)
+
+    def best_variables(self):
+        """Variables with the highest score (a live list; do not modify)."""
+        while not self.buckets[self.top]:
+            self.top -= 1
+        return self.buckets[self.top]
+
+
+def _run(step, clauses, n, occ, max_flips, restarts, rng, state_class=IncrementalState):
+    clauses = normalize_clauses(clauses)
+    if occ is None:
+        occ = instance_struct(clauses, n)
+    best = None
+    for r in range(restarts):
+        state = state_class(clauses, n, occ, [rng.random() < 0.5 for _ in range(n)])
+        flips = 0
+        while state.unsat and flips < max_flips:
+            step(state, rng)
+            flips += 1
+        result = state.result(flips, r + 1)
+        if best is None or result['sat_count'] > best['sat_count']:
+            best = result
+        if best['solved']:
+            break
+    return best
+
+
+def walksat(clauses, n, occ=None, noise=0.5, max_flips=100000, restarts=10, seed=None):
+    """WalkSAT/SKC: repair a random unsatisfied clause each step.
+
+    Flips a variable with zero break count if the clause has one; otherwise
+    a random variable of the clause with probability `noise`, or the one
+    with the fewest breaks. Returns the same result dict as the notebook's
+    hill_climbing().
+    """
+    rng = random.Random(seed)
+
+    def step(state, rng):
+        clause = state.clauses[state.unsat[rng.randrange(len(state.unsat))]]
+        brk = state.brk
+        best_v, best_b = None, None
+        for v, _ in clause:
+            b = brk[v]
+            if b == 0:
+                best_v = v
+                break
+            if best_b is None or b < best_b or (b == best_b and rng.random() < 0.5):
+                best_v, best_b = v, b
+        else:
+            if rng.random() < noise:
+                best_v = clause[rng.randrange(len(clause))][0]
+        state.flip(best_v)
+
+    return _run(step, clauses, n, occ, max_flips, restarts, rng)
+
+
+def gsat(clauses, n, occ=None, max_flips=100000, restarts=10, seed=None, walk_prob=0.0):
+    """GSAT: flip the variable with the best make - break score.
+
+    The argmax is over all n variables (ties broken at random), so at a
+    local minimum GSAT takes a sideways move (score 0) when one exists
+    before going uphill. Scores are kept in ScoredState buckets. With
+    walk_prob > 0 this becomes GWSAT: that fraction of steps flips a random
+    variable from a random unsatisfied clause instead.
+    """
+    rng = random.Random(seed)
+
+    def step(state, rng):
+        if walk_prob and rng.random() < walk_prob:
+            clause = state.clauses[state.unsat[rng.randrange(len(state.unsat))]]
+            state.flip(clause[rng.randrange(len(clause))][0])
+            return
+        best_vars = state.best_variables()
+        state.flip(best_vars[rng.randrange(len(best_vars))])
+
+    return _run(step, clauses, n, occ, max_flips, restarts, rng, ScoredState)
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = random.Random(1)
+    n = 100000
+    m = int(4.0 * n)  # just below the 3-SAT phase transition (~4.27)
+    clauses = [tuple((v, rng.random() < 0.5) for v in rng.sample(range(n), 3)) for _ in range(m)]
+
+    t0 = time.time()
+    out = walksat(clauses, n, noise=0.567, max_flips=2_000_000, restarts=1, seed=1)
+    t1 = time.time()
+    print(f"WalkSAT n={n} m={m}: solved={out['solved']} "
+          f"unsat={m - out['sat_count']} flips={out['iters']} "
+          f"({out['iters'] / (t1 - t0):.0f} flips/s)")
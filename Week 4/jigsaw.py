@@ -1,51 +1,174 @@
 import random
 import math
-import matplotlib.pyplot as plt
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+# matplotlib is only imported when a figure is requested
+_figure_writer = None
+
+
+def edge_cost_arrays(edge_costs, num_pieces):
+    """Convert a {(pieceA, pieceB, 'right'/'bottom'): cost} dict into two dense
+    (P, P) float32 arrays, right[a, b] and bottom[a, b]. Missing pairs cost 0."""
+    right = np.zeros((num_pieces, num_pieces), dtype=np.float32)
+    bottom = np.zeros((num_pieces, num_pieces), dtype=np.float32)
+    tables = {'right': right, 'bottom': bottom}
+    for (a, b, direction), cost in edge_costs.items():
+        tables[direction][a, b] = cost
+    return right, bottom
+
+
+# ----------------------
+# Cooling schedules
+# ----------------------
+# A schedule maps (temperature, step, accept_rate) to the next temperature;
+# accept_rate is a running average of the fraction of accepted moves.
+
+def geometric(rate=0.992):
+    """T <- rate * T."""
+    return lambda T, step, accept_rate: T * rate
+
+
+def linear(start_temp, min_temp, steps):
+    """Drop by a fixed amount so min_temp is reached after `steps` steps."""
+    drop = (start_temp - min_temp) / steps
+    return lambda T, step, accept_rate: max(T - drop, min_temp)
+
+
+def lundy_mees(beta=1e-3):
+    """Lundy & Mees (1986): T <- T / (1 + beta * T)."""
+    return lambda T, step, accept_rate: T / (1 + beta * T)
+
+
+def adaptive(target=0.3, rate=0.992, min_rate=None):
+    """Steer acceptance towards `target` with a proportional controller on log T.
+
+    Each step multiplies T by rate ** e, where e in [-1, 1] is the scaled
+    error (accept_rate - target): too many accepted moves cool, too few
+    heat back up. T is also kept under a ceiling that decays by `min_rate`
+    (default sqrt(rate)) every step, so the run reaches min_temp in at
+    most twice the steps of geometric(rate). A reheat or a new run above
+    the ceiling restarts it from there.
+    """
+    min_rate = math.sqrt(rate) if min_rate is None else min_rate
+    ceiling = None
+
+    def schedule(T, step, accept_rate):
+        nonlocal ceiling
+        ceiling = T if ceiling is None or T > ceiling else ceiling
+        ceiling *= min_rate
+        error = (accept_rate - target) / max(target, 1.0 - target)
+        return min(T * rate ** error, ceiling)
+    return schedule
+
 
 class PuzzleSimAnneal:
-    def __init__(self, grid_size, edge_costs, start_temp=1200, min_temp=1e-4, cool_rate=0.992, max_steps=12000):
+    def __init__(self, grid_size, edge_costs, start_temp=1200, min_temp=1e-4, cool_rate=0.992, max_steps=12000,
+                 schedule=None, reheat_after=None, reheat_temp=None, max_reheats=3, patience=None,
+                 target_cost=0.0, progress_every=1, progress_size=100_000):
         """
         grid_size: dimension of the puzzle (grid_size x grid_size)
-        edge_costs: dictionary mapping ((pieceA, pieceB), direction) -> mismatch value
+        edge_costs: either a dictionary mapping (pieceA, pieceB, direction) -> mismatch value,
+                    or a (right, bottom) pair of (P, P) arrays indexed [pieceA, pieceB]
         start_temp: initial temperature for annealing
         min_temp: lowest temperature threshold
         cool_rate: cooling multiplier per iteration
         max_steps: maximum number of iterations
+        schedule: cooling schedule (see geometric, linear, lundy_mees, adaptive);
+                  defaults to geometric(cool_rate)
+        reheat_after: reheat after this many steps without a new best (None = never)
+        reheat_temp: temperature to reheat to (default start_temp / 2)
+        max_reheats: how many times to reheat at most
+        patience: stop after this many steps without a new best (None = never)
+        target_cost: stop as soon as the best cost reaches this value
+        progress_every: record the best cost every this many steps
+        progress_size: keep at most this many progress records (None = all)
         """
         self.grid_size = grid_size
         self.num_pieces = grid_size * grid_size
-        self.edge_costs = edge_costs
+        if isinstance(edge_costs, dict):
+            edge_costs = edge_cost_arrays(edge_costs, self.num_pieces)
+        self.right = np.asarray(edge_costs[0], dtype=np.float32)
+        self.bottom = np.asarray(edge_costs[1], dtype=np.float32)
 
         self.temperature = start_temp
+        self.start_temp = start_temp
         self.min_temp = min_temp
         self.cool_rate = cool_rate
         self.max_steps = max_steps
+        self.schedule = schedule or geometric(cool_rate)
+
+        self.reheat_after = reheat_after
+        self.reheat_temp = start_temp / 2 if reheat_temp is None else reheat_temp
+        self.max_reheats = max_reheats
+        self.patience = patience
+        self.target_cost = target_cost
 
         # keep track of best result
         self.opt_state = None
         self.opt_cost = float('inf')
-        self.progress = []
+        self.progress_every = progress_every
+        self.progress = deque(maxlen=progress_size)
+        self.progress_steps = deque(maxlen=progress_size)
+        self.steps_run = 0
+        self.reheats = 0
 
     def evaluate(self, layout):
         """Compute total border mismatch for a given layout."""
-        cost = 0
+        grid = np.asarray(layout).reshape(self.grid_size, self.grid_size)
+        cost = self.right[grid[:, :-1], grid[:, 1:]].sum(dtype=np.float64)
+        cost += self.bottom[grid[:-1, :], grid[1:, :]].sum(dtype=np.float64)
+        return float(cost)
+
+    def evaluate_batch(self, layouts):
+        """Total mismatch of many layouts at once; `layouts` has shape (B, P)."""
         N = self.grid_size
-        for row in range(N):
-            for col in range(N):
-                index = row * N + col
-                piece = layout[index]
-
-                # right neighbor
-                if col < N - 1:
-                    right_piece = layout[index + 1]
-                    cost += self.edge_costs.get((piece, right_piece, 'right'), 0)
-
-                # bottom neighbor
-                if row < N - 1:
-                    below_piece = layout[index + N]
-                    cost += self.edge_costs.get((piece, below_piece, 'bottom'), 0)
+        grids = np.asarray(layouts).reshape(-1, N, N)
+        cost = self.right[grids[:, :, :-1], grids[:, :, 1:]].sum(axis=(1, 2), dtype=np.float64)
+        cost += self.bottom[grids[:, :-1, :], grids[:, 1:, :]].sum(axis=(1, 2), dtype=np.float64)
         return cost
 
+    def edges_at(self, pos):
+        """(position, direction) of every edge touching a grid position."""
+        N = self.grid_size
+        row, col = divmod(pos, N)
+        edges = []
+        if col < N - 1:
+            edges.append((pos, 'right'))
+        if col > 0:
+            edges.append((pos - 1, 'right'))
+        if row < N - 1:
+            edges.append((pos, 'bottom'))
+        if row > 0:
+            edges.append((pos - N, 'bottom'))
+        return edges
+
+    def edge_sum(self, layout, edges):
+        """Mismatch of the given edges only."""
+        N = self.grid_size
+        cost = 0
+        for pos, direction in edges:
+            if direction == 'right':
+                cost += self.right.item(layout[pos], layout[pos + 1])
+            else:
+                cost += self.bottom.item(layout[pos], layout[pos + N])
+        return cost
+
+    def swap_delta(self, layout, x, y):
+        """Swap positions x and y in place and return the change in cost.
+
+        Only the (at most 8) edges touching x or y can change, so this is
+        O(1) instead of a full evaluate(). Swap x and y again to undo.
+        """
+        edges = set(self.edges_at(x))
+        edges.update(self.edges_at(y))
+        before = self.edge_sum(layout, edges)
+        layout[x], layout[y] = layout[y], layout[x]
+        return self.edge_sum(layout, edges) - before
+
     def swap_random(self, layout):
         """Pick two random indices and swap them."""
         x, y = random.sample(range(len(layout)), 2)
@@ -61,56 +184,218 @@ class PuzzleSimAnneal:
 
         self.opt_state = current[:]
         self.opt_cost = current_cost
-        self.progress.append(current_cost)
+        self.temperature = self.start_temp
+        self.reheats = 0
+        self.reset_progress()
+        self.record(0)
 
         iteration = 0
+        stale = since_reheat = 0  # steps without a new best
+        accept_rate = 0.5
         while self.temperature > self.min_temp and iteration < self.max_steps:
-            candidate = current[:]
-            candidate = self.swap_random(candidate)
-            candidate_cost = self.evaluate(candidate)
+            # swap in place and score only the edges it touches
+            x, y = random.sample(range(self.num_pieces), 2)
+            delta = self.swap_delta(current, x, y)
 
-            delta = candidate_cost - current_cost
             # Accept better or probabilistically worse states
-            if delta < 0 or random.random() < math.exp(-delta / self.temperature):
-                current = candidate
-                current_cost = candidate_cost
+            accepted = delta < 0 or random.random() < math.exp(-delta / self.temperature)
+            if accepted:
+                current_cost += delta
                 if current_cost < self.opt_cost:
                     self.opt_state = current[:]
                     self.opt_cost = current_cost
+                    stale = since_reheat = -1
+            else:
+                # undo the rejected swap
+                current[x], current[y] = current[y], current[x]
+            stale += 1
+            since_reheat += 1
+            accept_rate += 0.01 * (accepted - accept_rate)
+            iteration += 1
+
+            if iteration % self.progress_every == 0:
+                self.record(iteration)
+            if self.opt_cost <= self.target_cost:
+                break
+            if self.patience is not None and stale >= self.patience:
+                break
 
             # gradually reduce temperature
-            self.temperature *= self.cool_rate
-            self.progress.append(self.opt_cost)
-            iteration += 1
+            self.temperature = self.schedule(self.temperature, iteration, accept_rate)
+
+            # stuck or frozen: restart from the best layout at a higher temperature
+            if (self.reheat_after is not None and self.reheats < self.max_reheats
+                    and (since_reheat >= self.reheat_after or self.temperature <= self.min_temp)):
+                self.reheats += 1
+                since_reheat = 0
+                current, current_cost = self.opt_state[:], self.opt_cost
+                self.temperature = max(self.temperature, self.reheat_temp)
 
+        self.steps_run = iteration
+        if iteration % self.progress_every:
+            self.record(iteration)
+        self.report()
+
+    def reset_progress(self):
+        """Start a fresh progress log; each solve()/parallel_tempering() run keeps its own."""
+        self.progress.clear()
+        self.progress_steps.clear()
+
+    def record(self, step):
+        self.progress.append(self.opt_cost)
+        self.progress_steps.append(step)
+
+    def report(self):
         print(f"✅ Best mismatch cost: {self.opt_cost}")
         print("🧩 Best puzzle configuration found:")
         for r in range(self.grid_size):
             print(self.opt_state[r*self.grid_size:(r+1)*self.grid_size])
 
-    def plot_progress(self):
-        """Visualize the cost decrease over time."""
-        plt.plot(self.progress)
-        plt.title("Simulated Annealing — Cost Evolution")
-        plt.xlabel("Iteration")
-        plt.ylabel("Total edge mismatch")
-        plt.grid(True)
-        plt.show()
+    def run_chain(self, layout, cost, temperature, steps, rng=random):
+        """Metropolis steps at a fixed temperature, updating layout in place.
+
+        Returns (cost, best_layout, best_cost) for this stretch of the chain.
+        """
+        best_layout, best_cost = layout[:], cost
+        for _ in range(steps):
+            x, y = rng.sample(range(self.num_pieces), 2)
+            delta = self.swap_delta(layout, x, y)
+            if delta < 0 or rng.random() < math.exp(-delta / temperature):
+                cost += delta
+                if cost < best_cost:
+                    best_layout, best_cost = layout[:], cost
+            else:
+                layout[x], layout[y] = layout[y], layout[x]
+        return cost, best_layout, best_cost
+
+    def parallel_tempering(self, n_chains=None, t_min=1.0, t_max=None, rounds=50,
+                           steps_per_round=2000, workers=None, seed=None):
+        """Run replicas on a geometric temperature ladder across worker processes.
+
+        Every round each replica does `steps_per_round` Metropolis steps at its
+        own temperature, then neighbouring replicas try to exchange states
+        (alternating even/odd pairs). The cost arrays are placed in shared
+        memory once and mapped by every worker instead of being pickled.
+        The best layout over all chains ends up in opt_state/opt_cost.
+        """
+        n_chains = n_chains or os.cpu_count() or 1
+        t_max = t_max or self.start_temp
+        ratio = t_min / t_max
+        temps = [t_max * ratio ** (k / max(n_chains - 1, 1)) for k in range(n_chains)]
+
+        rng = random.Random(seed)
+        layouts = [rng.sample(range(self.num_pieces), self.num_pieces) for _ in temps]
+        costs = [self.evaluate(layout) for layout in layouts]
+        best = min(range(n_chains), key=costs.__getitem__)
+        self.opt_state, self.opt_cost = layouts[best][:], costs[best]
+        self.reset_progress()
+        self.record(0)
+
+        shms, specs = [], []
+        try:
+            for table in (self.right, self.bottom):
+                shm = shared_memory.SharedMemory(create=True, size=table.nbytes)
+                shms.append(shm)
+                np.ndarray(table.shape, dtype=np.float32, buffer=shm.buf)[:] = table
+                specs.append((shm.name, table.shape))
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_tempering_worker,
+                                     initargs=(self.grid_size, *specs)) as pool:
+                for round_no in range(rounds):
+                    futures = [pool.submit(_tempering_chain, layouts[k], costs[k], temps[k],
+                                           steps_per_round, rng.randrange(2**32))
+                               for k in range(n_chains)]
+                    for k, future in enumerate(futures):
+                        layouts[k], costs[k], best_layout, best_cost = future.result()
+                        if best_cost < self.opt_cost:
+                            self.opt_state, self.opt_cost = best_layout, best_cost
+
+                    # replica exchange between neighbouring temperatures
+                    for k in range(round_no % 2, n_chains - 1, 2):
+                        arg = (costs[k] - costs[k + 1]) * (1 / temps[k] - 1 / temps[k + 1])
+                        if arg >= 0 or rng.random() < math.exp(arg):
+                            layouts[k], layouts[k + 1] = layouts[k + 1], layouts[k]
+                            costs[k], costs[k + 1] = costs[k + 1], costs[k]
+                    self.record((round_no + 1) * steps_per_round)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+        # the chains track cost by summed deltas; report the exact value
+        self.opt_cost = self.evaluate(self.opt_state)
+        return self.opt_state, self.opt_cost
+
+    def plot_progress(self, path=None):
+        """Visualize the cost decrease over time.
+
+        With `path` the figure is built without pyplot (no GUI backend) and
+        written to the file on a background thread; the returned Future
+        completes once it is on disk. Otherwise a window is shown.
+        """
+        global _figure_writer
+        if path is None:
+            import matplotlib.pyplot as plt
+            fig = plt.figure()
+        else:
+            from matplotlib.figure import Figure
+            fig = Figure()
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(self.progress_steps, self.progress)
+        ax.set_title("Simulated Annealing — Cost Evolution")
+        ax.set_xlabel("Iteration")
+        ax.set_ylabel("Total edge mismatch")
+        ax.grid(True)
+        if path is None:
+            plt.show()
+            return None
+        if _figure_writer is None:
+            _figure_writer = ThreadPoolExecutor(max_workers=1)
+        return _figure_writer.submit(fig.savefig, path)
+
+
+# ----------------------
+# Parallel tempering workers
+# ----------------------
+
+_worker_solver = None
+_worker_shms = []
+
+
+def _init_tempering_worker(grid_size, right_spec, bottom_spec):
+    """Map the shared cost arrays once per worker process."""
+    global _worker_solver
+    tables = []
+    for name, shape in (right_spec, bottom_spec):
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_shms.append(shm)  # keep the mapping alive
+        tables.append(np.ndarray(shape, dtype=np.float32, buffer=shm.buf))
+    _worker_solver = PuzzleSimAnneal(grid_size, tuple(tables))
+
+
+def _tempering_chain(layout, cost, temperature, steps, seed):
+    cost, best_layout, best_cost = _worker_solver.run_chain(
+        layout, cost, temperature, steps, random.Random(seed))
+    return layout, cost, best_layout, best_cost
 
 
 # ----------------------
 # Example Usage
 # ----------------------
 
-N = 3  # 3x3 puzzle
-edge_costs = {}
+if __name__ == "__main__":
+    import sys
+
+    N = 3  # 3x3 puzzle
+    edge_costs = {}
 
-# create dummy mismatch data for edges
-for i in range(N*N):
-    for j in range(N*N):
-        edge_costs[(i, j, 'right')] = random.randint(0, 10)
-        edge_costs[(i, j, 'bottom')] = random.randint(0, 10)
+    # create dummy mismatch data for edges
+    for i in range(N*N):
+        for j in range(N*N):
+            edge_costs[(i, j, 'right')] = random.randint(0, 10)
+            edge_costs[(i, j, 'bottom')] = random.randint(0, 10)
 
-solver = PuzzleSimAnneal(N, edge_costs)
-solver.solve()
-solver.plot_progress()
+    solver = PuzzleSimAnneal(N, edge_costs)
+    solver.solve()
+    # `python jigsaw.py progress.png` writes the plot instead of opening a window
+    solver.plot_progress(sys.argv[1] if len(sys.argv) > 1 else None)
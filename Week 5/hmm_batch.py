@@ -0,0 +1,167 @@
+import argparse
+import itertools
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from market_data import default_cache
+
+# -----------------------------
+# Batch HMM fitting and model selection
+# -----------------------------
+# One job per ticker: load its returns from the local cache once, fit every
+# (n_states, covariance_type, restart) combination and hand the rows back.
+# Models are compared by BIC/AIC; the chosen row per ticker is flagged and
+# everything (parameters as JSON) is written to one results table.
+
+
+def n_parameters(n_states, n_features, covariance_type):
+    """Free parameters of a Gaussian HMM, as used for AIC/BIC."""
+    N, d = n_states, n_features
+    covar = {
+        'full': N * d * (d + 1) // 2,
+        'tied': d * (d + 1) // 2,
+        'diag': N * d,
+        'spherical': N,
+    }[covariance_type]
+    return (N - 1) + N * (N - 1) + N * d + covar
+
+
+def load_returns(ticker, start, end, cache=None, column='Close'):
+    """(T, 1) daily returns of one ticker from the price cache."""
+    cache = cache or default_cache()
+    prices = cache.load(ticker, start, end)[column]
+    return prices.pct_change().dropna().to_numpy()[:, None]
+
+
+def fit_one(returns, n_states, covariance_type, seed, n_iter=1000):
+    """Fit one GaussianHMM; returns its scores and parameters as a dict."""
+    from hmmlearn.hmm import GaussianHMM
+
+    model = GaussianHMM(n_components=n_states, covariance_type=covariance_type,
+                        n_iter=n_iter, random_state=seed)
+    # non-convergence is reported in the row instead of logged
+    logging.getLogger('hmmlearn').setLevel(logging.ERROR)
+    model.fit(returns)
+    log_likelihood = model.score(returns)
+    k = n_parameters(n_states, returns.shape[1], covariance_type)
+    T = len(returns)
+    return {
+        'log_likelihood': log_likelihood,
+        'aic': 2 * k - 2 * log_likelihood,
+        'bic': k * np.log(T) - 2 * log_likelihood,
+        'n_params': k,
+        'converged': bool(model.monitor_.converged),
+        'iterations': model.monitor_.iter,
+        'startprob': json.dumps(model.startprob_.tolist()),
+        'transmat': json.dumps(model.transmat_.tolist()),
+        'means': json.dumps(model.means_.tolist()),
+        'covars': json.dumps(model.covars_.tolist()),
+    }
+
+
+def fit_ticker(ticker, start, end, states, covariance_types, restarts, n_iter=1000,
+               cache_root=None, offline=None):
+    """Every grid configuration for one ticker; returns a list of result rows."""
+    base = {'ticker': ticker}
+    try:
+        returns = load_returns(ticker, start, end, default_cache(cache_root, offline))
+    except Exception as exc:
+        return [dict(base, error=f"data: {exc}")]
+    if len(returns) < 2:
+        return [dict(base, error="data: no prices")]
+
+    rows = []
+    for n_states, cov, seed in itertools.product(states, covariance_types, range(restarts)):
+        row = dict(base, n_states=n_states, covariance_type=cov, seed=seed, n_obs=len(returns))
+        try:
+            row.update(fit_one(returns, n_states, cov, seed, n_iter))
+        except Exception as exc:
+            row['error'] = str(exc)
+        rows.append(row)
+    return rows
+
+
+def select_models(df, criterion='bic'):
+    """Flag the row with the lowest criterion per ticker in a 'selected' column."""
+    df = df.copy()
+    df['selected'] = False
+    if criterion in df:
+        fitted = df[df[criterion].notna()]
+        df.loc[fitted.groupby('ticker')[criterion].idxmin(), 'selected'] = True
+    return df
+
+
+def fit_universe(tickers, start, end, states=(2, 3), covariance_types=('full', 'diag'),
+                 restarts=3, n_iter=1000, workers=None, criterion='bic',
+                 cache_root=None, offline=None, progress=None):
+    """
+    Fit the grid for every ticker across a process pool and pick a model per
+    ticker by `criterion` ('bic' or 'aic'). Returns one DataFrame row per fit.
+    """
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fit_ticker, t, start, end, states, covariance_types,
+                               restarts, n_iter, cache_root, offline): t for t in tickers}
+        for future in as_completed(futures):
+            result = future.result()
+            rows.extend(result)
+            if progress:
+                progress(futures[future], result)
+    df = pd.DataFrame(rows)
+    for col in ('n_states', 'seed', 'n_obs'):
+        if col in df:
+            df[col] = df[col].astype('Int64')  # stays integer next to failed rows
+    return select_models(df, criterion)
+
+
+def save_table(df, path):
+    if str(path).endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit Gaussian HMMs over a universe of tickers.")
+    parser.add_argument('--tickers', nargs='+', default=['^GSPC'])
+    parser.add_argument('--tickers-file', help="one ticker per line (added to --tickers)")
+    parser.add_argument('--start', default='2014-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    parser.add_argument('--states', type=int, nargs='+', default=[2, 3])
+    parser.add_argument('--cov', nargs='+', default=['full', 'diag'],
+                        choices=['full', 'diag', 'tied', 'spherical'])
+    parser.add_argument('--restarts', type=int, default=3)
+    parser.add_argument('--n-iter', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--criterion', choices=['bic', 'aic'], default='bic')
+    parser.add_argument('--cache-dir', default=None, help="price cache directory")
+    parser.add_argument('--offline', action='store_true', help="use cached prices only")
+    parser.add_argument('--out', default='hmm_results.csv', help=".csv or .parquet")
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip()]
+
+    def report(ticker, rows):
+        fitted = [r for r in rows if 'error' not in r]
+        best = min(fitted, key=lambda r: r[args.criterion], default=None)
+        if best is None:
+            print(f"{ticker:<10} failed: {rows[0].get('error')}")
+        else:
+            print(f"{ticker:<10} {len(fitted)} fits, best {args.criterion}={best[args.criterion]:.1f} "
+                  f"(N={best['n_states']}, {best['covariance_type']})")
+
+    df = fit_universe(tickers, args.start, args.end, args.states, args.cov, args.restarts,
+                      args.n_iter, args.workers, args.criterion, args.cache_dir,
+                      args.offline or None, progress=report)
+    save_table(df, args.out)
+    chosen = df[df['selected']]
+    if len(chosen):
+        print(chosen[['ticker', 'n_states', 'covariance_type', 'seed', 'log_likelihood',
+                      'aic', 'bic']].to_string(index=False))
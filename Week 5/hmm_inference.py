@@ -0,0 +1,100 @@
+import numpy as np
+
+# -----------------------------
+# Forward / backward for a fitted HMM
+# -----------------------------
+# Works with any hmmlearn model (startprob_, transmat_ and per-state
+# emission log-likelihoods). Emissions for the whole series come from one
+# call. The recursion alpha_t = alpha_{t-1} A diag(b_t) is a chain of
+# N x N matrix products, so instead of a Python loop over T it is evaluated
+# as a prefix scan over blocks of steps with batched matmuls. Every partial
+# product is rescaled and its log scale is carried along, so nothing
+# underflows however long the series is.
+
+
+def emission_log_likelihood(hmm_model, observations):
+    """(T, N) array of log p(o_t | state) for every observation at once."""
+    X = np.asarray(observations, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    return hmm_model._compute_log_likelihood(X)
+
+
+def _emission_probs(log_b):
+    """Per-step rescaled emission probabilities and the log shift removed from each row."""
+    shift = log_b.max(axis=1)
+    return np.exp(log_b - shift[:, None]), shift
+
+
+def _chain(v, mats, block=1024):
+    """
+    Rows v M_1, v M_1 M_2, ..., each normalized to sum to 1.
+
+    Returns the (T, N) rows and log of the unnormalized sum of the last one
+    relative to sum(v). Each block of matrices is reduced with a
+    Hillis-Steele prefix scan (log2(block) batched matmuls).
+    """
+    T, N, _ = mats.shape
+    out = np.empty((T, N))
+    log_total = np.log(v.sum())
+    v = v / v.sum()
+    for s0 in range(0, T, block):
+        P = mats[s0:s0 + block].copy()
+        log_scale = np.zeros(len(P))
+        step = 1
+        while step < len(P):
+            prod = np.matmul(P[:-step], P[step:])
+            norm = np.einsum("tij->t", prod)
+            prod /= norm[:, None, None]
+            log_scale[step:] = log_scale[:-step] + log_scale[step:] + np.log(norm)
+            P[step:] = prod
+            step *= 2
+        rows = np.einsum("i,tij->tj", v, P)
+        sums = rows.sum(axis=1)
+        out[s0:s0 + len(P)] = rows / sums[:, None]
+        log_total += np.log(sums[-1]) + log_scale[-1]
+        v = out[s0 + len(P) - 1]
+    return out, log_total
+
+
+def forward(start_prob, transition_matrix, log_b, block=1024):
+    """
+    Scaled forward pass.
+
+    Returns:
+        log_prob: log P(O | λ)
+        alpha: (T, N) filtered probabilities P(state_t | o_1..o_t)
+    """
+    b, shift = _emission_probs(log_b)
+    A = np.asarray(transition_matrix, dtype=float)
+    v0 = np.asarray(start_prob, dtype=float) * b[0]
+    mats = A[None, :, :] * b[1:, None, :]  # A diag(b_t)
+    rest, log_rest = _chain(v0, mats, block)
+    alpha = np.vstack([v0 / v0.sum(), rest])
+    return float(log_rest + shift.sum()), alpha
+
+
+def backward(transition_matrix, log_b, block=1024):
+    """Scaled backward pass; each row of beta is normalized to sum to 1."""
+    b, _ = _emission_probs(log_b)
+    A = np.asarray(transition_matrix, dtype=float)
+    T, N = b.shape
+    # beta_t = A diag(b_{t+1}) beta_{t+1}, run as a chain from the end
+    mats = (A[None, :, :] * b[:0:-1, None, :]).transpose(0, 2, 1)
+    rest, _ = _chain(np.ones(N), mats, block)
+    return np.vstack([rest[::-1], np.full(N, 1.0 / N)])
+
+
+def forward_backward(hmm_model, observations, block=1024):
+    """
+    log P(O | λ) and smoothed posteriors P(state_t | O) for a fitted model.
+
+    Returns:
+        tuple: (log_prob, posteriors) with posteriors of shape (T, N)
+    """
+    log_b = emission_log_likelihood(hmm_model, observations)
+    log_prob, alpha = forward(hmm_model.startprob_, hmm_model.transmat_, log_b, block)
+    beta = backward(hmm_model.transmat_, log_b, block)
+    posteriors = alpha * beta
+    posteriors /= posteriors.sum(axis=1, keepdims=True)
+    return log_prob, posteriors
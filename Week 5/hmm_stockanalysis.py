@@ -1,130 +1,192 @@
-import yfinance as yf
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from hmmlearn.hmm import GaussianHMM
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-# -----------------------------
-# Download S&P500 Historical Data
-# -----------------------------
-stock_ticker = '^GSPC'
-start_date = '2014-01-01'
-end_date = '2025-12-31'
-
-stock_data = yf.download(stock_ticker, start=start_date, end=end_date)
-
-print("Sample Data:")
-print(stock_data.head())
-
-# ---------------------------------------
-# Fix for the new Yahoo Finance structure
-# ---------------------------------------
-# Extract close prices from multi-index columns
-close_prices = stock_data[('Price', 'Close')]
+from hmm_inference import emission_log_likelihood, forward, forward_backward
+from market_data import default_cache
 
-# Compute returns
-stock_data['Returns'] = close_prices.pct_change()
-stock_data.dropna(inplace=True)
+# matplotlib and hmmlearn are imported inside the functions that need them,
+# so importing this module (e.g. from a batch job) stays cheap.
 
-print("Returns Data:")
-print(stock_data[[('Price', 'Close'), 'Returns']].head())
 
 # -----------------------------
-# Plot Close Prices & Returns
+# Load S&P500 Historical Data (cached locally)
 # -----------------------------
-plt.figure(figsize=(10, 6))
+def load_data(stock_ticker='^GSPC', start_date='2014-01-01', end_date='2025-12-31', cache=None):
+    """Prices plus a 'Returns' column of daily close-to-close returns."""
+    # reads Week 5/data, downloading only date ranges not cached yet;
+    # set MARKET_DATA_OFFLINE=1 to never touch the network
+    stock_data = (cache or default_cache()).load(stock_ticker, start_date, end_date).copy()
 
-# Close price plot
-plt.subplot(2, 1, 1)
-plt.plot(stock_data.index, close_prices.loc[stock_data.index], color='blue')
-plt.title('S&P 500 Close Prices (2014–2025)')
-plt.xlabel('Date')
-plt.ylabel('Price')
+    # Columns are normalized by market_data (Open/High/Low/Close/Adj Close/Volume)
+    stock_data['Returns'] = stock_data['Close'].pct_change()
+    stock_data.dropna(subset=['Returns'], inplace=True)
+    return stock_data
 
-# Returns plot
-plt.subplot(2, 1, 2)
-plt.plot(stock_data.index, stock_data['Returns'], color='green')
-plt.title('S&P 500 Daily Returns (2014–2025)')
-plt.xlabel('Date')
-plt.ylabel('Returns')
-
-plt.tight_layout()
-plt.show()
 
 # -----------------------------
 # Fit Gaussian HMM to returns
 # -----------------------------
-returns_data = stock_data[['Returns']].values
-n_states = 2
+def fit_model(returns_data, n_states=2, covariance_type="full", n_iter=1000):
+    from hmmlearn.hmm import GaussianHMM
 
-hmm_model = GaussianHMM(
-    n_components=n_states,
-    covariance_type="full",
-    n_iter=1000
-)
+    hmm_model = GaussianHMM(
+        n_components=n_states,
+        covariance_type=covariance_type,
+        n_iter=n_iter
+    )
+    hmm_model.fit(returns_data)
+    return hmm_model
 
-hmm_model.fit(returns_data)
 
 def forward_algorithm(hmm_model, returns):
-    transition_matrix = hmm_model.transmat_
-    start_prob = hmm_model.startprob_
-
-    T = returns.shape[0]
-    N = hmm_model.n_components
-
-    alpha = np.zeros((T, N))
-
-    # emission prob for first observation
-    log_likelihood = hmm_model._compute_log_likelihood(returns[:1])[0]
+    """log P(O | λ) and the filtered probabilities alpha (see hmm_inference)."""
+    log_b = emission_log_likelihood(hmm_model, returns)
+    return forward(hmm_model.startprob_, hmm_model.transmat_, log_b)
 
-    for i in range(N):
-        alpha[0, i] = start_prob[i] * np.exp(log_likelihood[i])
 
-    # recursive steps
-    for t in range(1, T):
-        log_likelihood = hmm_model._compute_log_likelihood(returns[t:t+1])[0]
-        for j in range(N):
-            alpha[t, j] = np.sum(alpha[t-1, :] * transition_matrix[:, j]) * np.exp(log_likelihood[j])
+def analyze(stock_data, n_states=2, covariance_type="full", n_iter=1000):
+    """Fit the HMM and add hidden states and regime probabilities to stock_data."""
+    returns_data = stock_data[['Returns']].values
+    hmm_model = fit_model(returns_data, n_states, covariance_type, n_iter)
 
-    P_O_given_lambda = np.sum(alpha[-1, :])
-    return P_O_given_lambda, alpha
+    # log P(O | λ) and smoothed regime probabilities P(state_t | O) in one pass
+    log_P_O_given_lambda, posteriors = forward_backward(hmm_model, returns_data)
+    for i in range(n_states):
+        stock_data[f'P_State_{i}'] = posteriors[:, i]
 
-P_O_given_lambda, alpha = forward_algorithm(hmm_model, returns_data)
-print(f"P(O | λ) = {P_O_given_lambda}")
+    stock_data['Hidden_State'] = hmm_model.predict(returns_data)
+    return hmm_model, log_P_O_given_lambda
 
-hidden_states = hmm_model.predict(returns_data)
-stock_data['Hidden_State'] = hidden_states
 
-plt.figure(figsize=(12, 8))
-plt.plot(stock_data.index, close_prices.loc[stock_data.index], label='Close Price')
-
-for i in range(n_states):
-    state_mask = (hidden_states == i)
-    plt.fill_between(
-        stock_data.index,
-        close_prices.loc[stock_data.index].min(),
-        close_prices.loc[stock_data.index],
-        where=state_mask,
-        alpha=0.3,
-        label=f"State {i} — {'High Volatility' if i == 1 else 'Low Volatility'}"
-    )
-
-plt.title('S&P 500 Close Prices with Hidden Markov States')
-plt.xlabel('Date')
-plt.ylabel('Price')
-plt.legend()
-plt.show()
-
-print("\nMeans of Hidden States:")
-print(hmm_model.means_)
-
-print("\nCovariances of Hidden States:")
-print(hmm_model.covars_)
-
-print("\nTransition Matrix:")
-print(hmm_model.transmat_)
-
-plt.matshow(hmm_model.transmat_, cmap='viridis')
-plt.title("HMM Transition Matrix")
-plt.colorbar()
-plt.show()
+# -----------------------------
+# Figures
+# -----------------------------
+# With headless=True figures are built on matplotlib.figure.Figure directly
+# (no pyplot, no GUI backend) and saved by a background thread, so fitting
+# can carry on while PNGs are rendered.
+
+_figure_writer = None
+
+
+def new_figure(figsize, headless=False):
+    if headless:
+        from matplotlib.figure import Figure
+        return Figure(figsize=figsize)
+    import matplotlib.pyplot as plt
+    return plt.figure(figsize=figsize)
+
+
+def save_figure_async(fig, path, **kwargs):
+    """Render and write a figure on a background thread; returns a Future."""
+    global _figure_writer
+    if _figure_writer is None:
+        _figure_writer = ThreadPoolExecutor(max_workers=1)
+    return _figure_writer.submit(fig.savefig, path, **kwargs)
+
+
+def plot_prices_and_returns(stock_data, headless=False):
+    fig = new_figure((10, 6), headless)
+
+    # Close price plot
+    ax = fig.add_subplot(2, 1, 1)
+    ax.plot(stock_data.index, stock_data['Close'], color='blue')
+    ax.set_title('S&P 500 Close Prices (2014–2025)')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price')
+
+    # Returns plot
+    ax = fig.add_subplot(2, 1, 2)
+    ax.plot(stock_data.index, stock_data['Returns'], color='green')
+    ax.set_title('S&P 500 Daily Returns (2014–2025)')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Returns')
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_hidden_states(stock_data, n_states, headless=False):
+    fig = new_figure((12, 8), headless)
+    ax = fig.add_subplot(1, 1, 1)
+    close_prices = stock_data['Close']
+    hidden_states = stock_data['Hidden_State'].values
+    ax.plot(stock_data.index, close_prices, label='Close Price')
+
+    for i in range(n_states):
+        state_mask = (hidden_states == i)
+        ax.fill_between(
+            stock_data.index,
+            close_prices.min(),
+            close_prices,
+            where=state_mask,
+            alpha=0.3,
+            label=f"State {i} — {'High Volatility' if i == 1 else 'Low Volatility'}"
+        )
+
+    ax.set_title('S&P 500 Close Prices with Hidden Markov States')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price')
+    ax.legend()
+    return fig
+
+
+def plot_transition_matrix(hmm_model, headless=False):
+    fig = new_figure((5, 5), headless)
+    ax = fig.add_subplot(1, 1, 1)
+    image = ax.matshow(hmm_model.transmat_, cmap='viridis')
+    ax.set_title("HMM Transition Matrix")
+    fig.colorbar(image)
+    return fig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gaussian HMM regimes of an index.")
+    parser.add_argument('--ticker', default='^GSPC')
+    parser.add_argument('--start', default='2014-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    parser.add_argument('--states', type=int, default=2)
+    parser.add_argument('--figures', metavar='DIR',
+                        help="write figures to DIR as PNG instead of opening windows")
+    parser.add_argument('--no-plots', action='store_true', help="skip figures entirely")
+    args = parser.parse_args(argv)
+
+    stock_data = load_data(args.ticker, args.start, args.end)
+    print("Sample Data:")
+    print(stock_data.head())
+    print("Returns Data:")
+    print(stock_data[['Close', 'Returns']].head())
+
+    hmm_model, log_P_O_given_lambda = analyze(stock_data, args.states)
+    print(f"log P(O | λ) = {log_P_O_given_lambda}")
+
+    print("\nMeans of Hidden States:")
+    print(hmm_model.means_)
+
+    print("\nCovariances of Hidden States:")
+    print(hmm_model.covars_)
+
+    print("\nTransition Matrix:")
+    print(hmm_model.transmat_)
+
+    if args.no_plots:
+        return
+    headless = args.figures is not None
+    figures = {
+        'prices_returns': plot_prices_and_returns(stock_data, headless),
+        'hidden_states': plot_hidden_states(stock_data, args.states, headless),
+        'transition_matrix': plot_transition_matrix(hmm_model, headless),
+    }
+    if headless:
+        os.makedirs(args.figures, exist_ok=True)
+        pending = [save_figure_async(fig, os.path.join(args.figures, f"{name}.png"))
+                   for name, fig in figures.items()]
+        for future in pending:
+            future.result()
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()  # one blocking call for all windows
+
+
+if __name__ == "__main__":
+    main()
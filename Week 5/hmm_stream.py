@@ -0,0 +1,181 @@
+from collections import deque
+
+import numpy as np
+
+# -----------------------------
+# Streaming regime filter
+# -----------------------------
+# Keeps only the current forward vector, so each new bar costs one N x N
+# matrix-vector product plus N Gaussian densities instead of a refit or a
+# predict() over the whole history. A fixed-lag smoother revisits the last
+# `lag` bars, and parameters can be refreshed online from exponentially
+# forgotten sufficient statistics or replaced by a periodic batch refit.
+
+
+class RegimeFilter:
+    """
+    Online forward filter for a Gaussian HMM with full covariances.
+
+    lag: bars of look-ahead for smoothed() (0 = filtering only)
+    online_em: update means/covariances/transitions from the stream
+    forget: forgetting factor of the online sufficient statistics
+    refresh_every: ticks between parameter refreshes in online EM
+    """
+
+    def __init__(self, startprob, transmat, means, covars, lag=0, online_em=False,
+                 forget=0.999, refresh_every=100, min_covar=1e-6):
+        self.lag = lag
+        self.online_em = online_em
+        self.forget = forget
+        self.refresh_every = refresh_every
+        self.min_covar = min_covar
+        self.set_params(startprob, transmat, means, covars)
+
+        self.alpha = self.startprob.copy()
+        self.t = 0
+        self.log_likelihood = 0.0
+        self._recent = deque(maxlen=lag + 1)  # (filtered alpha, scaled emissions) per bar
+        if online_em:
+            self._init_stats()
+
+    @classmethod
+    def from_model(cls, hmm_model, **kwargs):
+        """Filter with the parameters of a fitted hmmlearn GaussianHMM."""
+        return cls(hmm_model.startprob_, hmm_model.transmat_, hmm_model.means_,
+                   hmm_model.covars_, **kwargs)
+
+    def set_params(self, startprob, transmat, means, covars):
+        """Swap in new parameters (e.g. from a periodic refit) keeping the filter state."""
+        self.startprob = np.asarray(startprob, dtype=float)
+        self.transmat = np.asarray(transmat, dtype=float)
+        self.means = np.atleast_2d(np.asarray(means, dtype=float))
+        covars = np.asarray(covars, dtype=float)
+        N, d = self.means.shape
+        self.covars = covars.reshape(N, d, d)
+        # whitening: (x - mu)^T S^-1 (x - mu) = |W x - W mu|^2 with W = chol(S)^-1
+        chol = np.linalg.cholesky(self.covars)
+        W = np.linalg.inv(chol)
+        self._whiten = W.reshape(N * d, d)
+        self._offset = np.einsum('nde,ne->nd', W, self.means)
+        logdet = 2 * np.log(np.diagonal(chol, axis1=1, axis2=2)).sum(axis=1)
+        self._log_norm = -0.5 * (d * np.log(2 * np.pi) + logdet)
+
+    def _log_emission(self, x):
+        z = np.dot(self._whiten, x).reshape(self._offset.shape) - self._offset
+        return self._log_norm - 0.5 * np.einsum('nd,nd->n', z, z)
+
+    # ---- filtering ----
+
+    def update(self, x):
+        """Add one observation; returns P(state_t | o_1..o_t)."""
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        log_b = self._log_emission(x)
+        shift = log_b.max()
+        b = np.exp(log_b - shift)
+
+        prev = self.alpha
+        prior = np.dot(prev, self.transmat) if self.t else self.startprob
+        a = prior * b
+        c = a.sum()
+        a /= c
+        self.log_likelihood += np.log(c) + shift
+
+        if self.online_em:
+            self._accumulate(x, prev, a, b)
+        self.alpha = a
+        self.t += 1
+        if self.lag:
+            self._recent.append((a, b))
+        return a
+
+    def run(self, observations):
+        """Feed a whole series; returns the (T, N) filtered probabilities."""
+        return np.array([self.update(x) for x in observations])
+
+    def regime(self):
+        """Most likely current state."""
+        return int(self.alpha.argmax())
+
+    def smoothed(self):
+        """
+        P(state_{t-lag} | o_1..o_t) for the latest tick t, in O(lag N^2).
+
+        Returns None until lag + 1 observations have been seen.
+        """
+        if not self.lag:
+            return self.alpha
+        if len(self._recent) <= self.lag:
+            return None
+        items = list(self._recent)
+        beta = np.ones(len(self.alpha))
+        for _, b in reversed(items[1:]):
+            beta = np.dot(self.transmat, b * beta)
+            beta /= beta.sum()
+        p = items[0][0] * beta
+        return p / p.sum()
+
+    # ---- online EM ----
+
+    def _init_stats(self):
+        # seed the statistics with the current parameters as a prior
+        N = len(self.startprob)
+        w = np.full(N, 1.0 / N)
+        self._s0 = w.copy()
+        self._s1 = w[:, None] * self.means
+        self._s2 = w[:, None, None] * (self.covars + np.einsum('nd,ne->nde', self.means, self.means))
+        self._sxi = w[:, None] * self.transmat
+
+    def _accumulate(self, x, prev, gamma, b):
+        f, rho = self.forget, 1.0 - self.forget
+        self._s0 = f * self._s0 + rho * gamma
+        self._s1 = f * self._s1 + rho * gamma[:, None] * x
+        self._s2 = f * self._s2 + rho * gamma[:, None, None] * np.outer(x, x)
+        if self.t:
+            xi = prev[:, None] * self.transmat * b[None, :]
+            self._sxi = f * self._sxi + rho * xi / xi.sum()
+        if (self.t + 1) % self.refresh_every == 0:
+            self.refresh()
+
+    def refresh(self):
+        """Re-estimate the parameters from the online sufficient statistics."""
+        s0 = self._s0[:, None]
+        means = self._s1 / s0
+        d = means.shape[1]
+        covars = self._s2 / s0[:, :, None] - np.einsum('nd,ne->nde', means, means)
+        covars += self.min_covar * np.eye(d)
+        transmat = self._sxi / self._sxi.sum(axis=1, keepdims=True)
+        self.set_params(self.startprob, transmat, means, covars)
+
+
+if __name__ == "__main__":
+    import time
+
+    from hmmlearn.hmm import GaussianHMM
+
+    from hmm_inference import emission_log_likelihood, forward, forward_backward
+
+    rng = np.random.default_rng(0)
+    calm = lambda k: rng.normal(0.0005, 0.008, k)
+    wild = lambda k: rng.normal(-0.001, 0.03, k)
+    returns = np.concatenate([calm(2000), wild(300), calm(2000), wild(300), calm(1400)])[:, None]
+
+    model = GaussianHMM(n_components=2, covariance_type="full", n_iter=200, random_state=0)
+    model.fit(returns)
+
+    lag = 10
+    stream = RegimeFilter.from_model(model, lag=lag)
+    t0 = time.perf_counter()
+    filtered, smoothed = [], []
+    for x in returns:
+        filtered.append(stream.update(x))
+        smoothed.append(stream.smoothed())
+    per_tick = (time.perf_counter() - t0) / len(returns)
+
+    log_prob, alpha = forward(model.startprob_, model.transmat_, emission_log_likelihood(model, returns))
+    _, posteriors = forward_backward(model, returns)
+    print(f"per tick (filter + {lag}-lag smoother): {per_tick * 1e6:.1f} us")
+    print("max |filtered - batch forward|:", np.abs(np.array(filtered) - alpha).max())
+    print("log-likelihood streamed / batch:", stream.log_likelihood, log_prob)
+    lagged = np.array(smoothed[lag:])
+    agree = (lagged.argmax(axis=1) == posteriors[:-lag].argmax(axis=1)).mean()
+    print(f"{lag}-lag smoother agrees with full smoothing on {agree:.1%} of bars")
@@ -0,0 +1,184 @@
+import importlib.util
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Local market-data cache
+# -----------------------------
+# Daily bars are stored per ticker under one directory as Parquet, CSV or a
+# memory-mapped .npy record array, next to a small JSON file listing the
+# date ranges that have already been fetched. Only the parts of a requested
+# range outside those ranges are downloaded, and only if a provider is set, so
+# runs without network work from whatever is on disk.
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
+def normalize_prices(frame):
+    """
+    Bring a price table into the cache schema: a DatetimeIndex named 'Date'
+    and float columns COLUMNS, whatever layout the provider returned.
+
+    Handles flat columns, yfinance's ('Price', 'Close') / ('Close', ticker)
+    MultiIndex layouts and lower-case names. 'Adj Close' falls back to
+    'Close' when missing (auto-adjusted downloads).
+    """
+    frame = frame.copy()
+    if isinstance(frame.columns, pd.MultiIndex):
+        known = {c.lower() for c in COLUMNS}
+        frame.columns = [next((str(part) for part in col if str(part).lower() in known), str(col[-1]))
+                         for col in frame.columns]
+    names = {c.lower().replace('_', ' '): c for c in COLUMNS}
+    frame = frame.rename(columns=lambda c: names.get(str(c).lower().replace('_', ' '), c))
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    if 'Adj Close' not in frame and 'Close' in frame:
+        frame['Adj Close'] = frame['Close']
+
+    frame.index = pd.to_datetime(frame.index).tz_localize(None)
+    frame.index.name = 'Date'
+    out = pd.DataFrame(index=frame.index)
+    for col in COLUMNS:
+        out[col] = frame[col].astype(float) if col in frame else np.nan
+    return out.sort_index()
+
+
+def yahoo_provider(ticker, start, end):
+    """Download daily bars from Yahoo Finance for [start, end)."""
+    import yfinance as yf  # only needed when something has to be fetched
+    data = yf.download(ticker, start=start, end=end, auto_adjust=False, progress=False)
+    return normalize_prices(data) if len(data) else pd.DataFrame(columns=COLUMNS)
+
+
+class PriceCache:
+    """
+    Per-ticker price store with incremental fetching.
+
+    root: directory for the cache files
+    fmt: 'parquet', 'csv' or 'npy' (memory-mapped on read)
+    provider: callable (ticker, start, end) -> DataFrame, or None for offline use
+    """
+
+    def __init__(self, root, fmt='parquet', provider=None):
+        if fmt not in ('parquet', 'csv', 'npy'):
+            raise ValueError(f"unknown format: {fmt!r}")
+        self.root = root
+        self.fmt = fmt
+        self.provider = provider
+
+    def _path(self, ticker, ext):
+        safe = ''.join(ch if ch.isalnum() or ch in '-_.' else '_' for ch in ticker)
+        return os.path.join(self.root, f"{safe}.{ext}")
+
+    # ---- storage ----
+
+    def read(self, ticker):
+        """Everything cached for a ticker (an empty frame if nothing is)."""
+        path = self._path(ticker, self.fmt)
+        if not os.path.exists(path):
+            return normalize_prices(pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([])))
+        if self.fmt == 'parquet':
+            return pd.read_parquet(path)
+        if self.fmt == 'csv':
+            return pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+        records = np.load(path, mmap_mode='r')
+        frame = pd.DataFrame({col: records[col] for col in COLUMNS},
+                             index=pd.DatetimeIndex(records['Date'], name='Date'))
+        return frame
+
+    def write(self, ticker, frame):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(ticker, self.fmt)
+        tmp = path + '.tmp'
+        if self.fmt == 'parquet':
+            frame.to_parquet(tmp)
+        elif self.fmt == 'csv':
+            frame.to_csv(tmp)
+        else:
+            dtype = [('Date', 'M8[ns]')] + [(col, 'f8') for col in COLUMNS]
+            records = np.empty(len(frame), dtype=dtype)
+            records['Date'] = frame.index.values
+            for col in COLUMNS:
+                records[col] = frame[col].to_numpy()
+            with open(tmp, 'wb') as f:
+                np.save(f, records)
+        os.replace(tmp, path)
+
+    def coverage(self, ticker):
+        """Sorted, disjoint [start, end) date ranges already fetched for a ticker."""
+        path = self._path(ticker, 'json')
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            meta = json.load(f)
+        return [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in meta['intervals']]
+
+    def _add_coverage(self, ticker, ranges):
+        """Merge newly fetched ranges into the coverage file."""
+        merged = []
+        for a, b in sorted(self.coverage(ticker) + [r for r in ranges if r[0] < r[1]]):
+            if merged and a <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._path(ticker, 'json'), 'w') as f:
+            json.dump({'intervals': [[a.strftime('%Y-%m-%d'), b.strftime('%Y-%m-%d')]
+                                     for a, b in merged]}, f)
+
+    # ---- loading ----
+
+    def missing_ranges(self, ticker, start, end):
+        """Half-open [start, end) pieces of the request that were never fetched."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        gaps = []
+        for have_start, have_end in self.coverage(ticker):
+            if have_end <= start or have_start >= end:
+                continue
+            if have_start > start:
+                gaps.append((start, have_start))
+            start = max(start, have_end)
+        if start < end:
+            gaps.append((start, end))
+        return gaps
+
+    def load(self, ticker, start, end):
+        """
+        Prices for [start, end), fetching uncovered ranges from the provider
+        first when one is configured. Without a provider only what is on
+        disk is returned.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        gaps = self.missing_ranges(ticker, start, end) if self.provider else []
+        frame = self.read(ticker)
+        # provider errors propagate; a gap that came back empty (e.g. a failed
+        # download) is not marked as fetched, so the next run asks again
+        fetched = [(a, b, normalize_prices(self.provider(ticker, a, b))) for a, b in gaps]
+        fetched = [(a, b, part) for a, b, part in fetched if len(part)]
+        if fetched:
+            parts = [p for p in [frame] + [part for _, _, part in fetched] if len(p)]
+            frame = pd.concat(parts)
+            frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            self.write(ticker, frame)
+            # never mark the future as fetched, so later runs pick up new bars
+            today = pd.Timestamp(date.today())
+            self._add_coverage(ticker, [(a, min(b, today)) for a, b, _ in fetched])
+        return frame.loc[(frame.index >= start) & (frame.index < end)]
+
+
+def default_cache(root=None, offline=None):
+    """
+    Cache under Week 5/data (or $MARKET_DATA_DIR) that downloads from Yahoo
+    unless MARKET_DATA_OFFLINE is set. Parquet needs pyarrow or fastparquet;
+    CSV is used otherwise.
+    """
+    root = root or os.environ.get('MARKET_DATA_DIR') or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    if offline is None:
+        offline = bool(os.environ.get('MARKET_DATA_OFFLINE'))
+    has_parquet = any(importlib.util.find_spec(m) for m in ('pyarrow', 'fastparquet'))
+    fmt = 'parquet' if has_parquet else 'csv'
+    return PriceCache(root, fmt=fmt, provider=None if offline else yahoo_provider)
@@ -1,9 +1,10 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from hmmlearn.hmm import GaussianHMM
 
+from market_data import default_cache
+
 # collecting Data 
 # Downloading  data (yahoo data)
 stock_ticker = '^GSPC'
@@ -11,7 +12,7 @@ start_date = '2014-01-01'
 end_date = '2025-12-31'
 
 # Fetch data
-stock_data = yf.download(stock_ticker, start=start_date, end=end_date)
+stock_data = default_cache().load(stock_ticker, start_date, end_date)
 
 
 print("Sample Data: ")